@@ -0,0 +1,265 @@
+import os
+import sys
+import json
+import random
+import asyncio
+import logging
+from http import HTTPStatus
+from typing import Dict, Iterable
+
+import aiohttp
+
+import homework
+import metrics
+import startup
+import tenants
+from tenants import Tenant, TenantState
+from exceptions import APIError, LogError, SendMessageError
+from scheduler import policy_from_env
+from state_store import StateStore
+from rate_limit import RateLimiter
+
+
+TELEGRAM_ENDPOINT = homework.TELEGRAM_API_URL + '{token}/sendMessage'
+MAX_IN_FLIGHT = 1000
+REQUEST_TIMEOUT = 30
+FLUSH_INTERVAL = 5
+MAX_SEND_RETRIES = 5
+START_RATE = 50
+
+limiter = RateLimiter()
+
+
+async def get_api_answer_async(session: aiohttp.ClientSession,
+                               token: str, current_timestamp: int) -> dict:
+    """Асинхронное получение ответа от API через общий предохранитель."""
+    headers = {'Authorization': f'OAuth {token}'}
+    cache = homework.response_cache
+    etag = cache.etag(token) if cache is not None else None
+    if etag:
+        headers['If-None-Match'] = etag
+    params = {'from_date': current_timestamp}
+    breaker = homework.api_breaker
+    breaker.before_call()
+
+    with metrics.track(metrics.API_REQUEST, metrics.API_ERRORS):
+        try:
+            async with session.get(
+                homework.ENDPOINT, headers=headers, params=params
+            ) as response:
+                if response.status >= HTTPStatus.INTERNAL_SERVER_ERROR:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+                if etag and response.status == HTTPStatus.NOT_MODIFIED:
+                    return cache.not_modified(current_timestamp)
+                if response.status != HTTPStatus.OK:
+                    raise APIError(
+                        f'Сервер сервиса не дал ответа. {response.status}.'
+                    )
+                return await decode_async(token, response)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as error:
+            breaker.record_failure()
+            raise APIError(
+                error,
+                'Ошибка при получении ответа от API.'
+            )
+
+
+async def decode_async(token: str,
+                       response: aiohttp.ClientResponse) -> dict:
+    """Разбор ответа API с пропуском повторов через общий кэш."""
+    cache = homework.response_cache
+    if cache is None:
+        return await response.json()
+    body = await response.read()
+    digest, unchanged = cache.lookup(token, body)
+    if unchanged is not None:
+        return unchanged
+    try:
+        data = json.loads(body)
+    except ValueError as error:
+        raise APIError(error, 'Ответ API не является JSON.')
+    cache.store(token, digest, response.headers.get('ETag'), data)
+    return data
+
+
+async def send_message_async(session: aiohttp.ClientSession,
+                             chat_id: str, message: str) -> None:
+    """Асинхронная отправка сообщения через Bot API телеграма.
+
+    Ответ 429 обрабатывается повтором после паузы из `retry_after`.
+    """
+    url = TELEGRAM_ENDPOINT.format(token=homework.TELEGRAM_TOKEN)
+    wait = limiter.acquire(str(chat_id))
+    if wait < 0:
+        raise SendMessageError(
+            f'Сообщение в чат {chat_id} отброшено по лимиту.'
+        )
+    await asyncio.sleep(wait)
+    payload = dict(homework.SEND_OPTIONS, chat_id=chat_id, text=message)
+    with metrics.track(metrics.SEND, metrics.SEND_ERRORS):
+        try:
+            for attempt in range(1, MAX_SEND_RETRIES + 1):
+                async with session.post(
+                    url, json=payload
+                ) as response:
+                    if response.status != HTTPStatus.TOO_MANY_REQUESTS:
+                        break
+                    data = await response.json()
+                if attempt == MAX_SEND_RETRIES:
+                    break
+                await asyncio.sleep(
+                    data.get('parameters', {}).get('retry_after', 1)
+                )
+            if response.status != HTTPStatus.OK:
+                raise SendMessageError(
+                    f'Ошибка в заимодействии с API ТГ. {response.status}.'
+                )
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            raise SendMessageError('Ошибка в заимодействии с API ТГ.')
+        else:
+            logging.info('Сообщение отправлено.')
+
+
+async def fan_out(session: aiohttp.ClientSession,
+                  chat_ids: Iterable[str], message: str) -> None:
+    """Одновременная рассылка сообщения во все чаты подписки."""
+    results = await asyncio.gather(
+        *(send_message_async(session, chat_id, message)
+          for chat_id in chat_ids),
+        return_exceptions=True
+    )
+    for result in results:
+        if isinstance(result, LogError):
+            logging.error(result)
+        elif isinstance(result, Exception):
+            raise result
+
+
+async def notify_async(session: aiohttp.ClientSession, tenant: Tenant,
+                       notice: str) -> None:
+    """Служебное уведомление; его сбой не останавливает цикл опроса."""
+    try:
+        await fan_out(
+            session, tenant.chat_ids, homework.renderer.escape(notice)
+        )
+    except Exception as error:
+        logging.error(f'Не удалось отправить уведомление: {error}')
+
+
+async def poll_tenant_async(session: aiohttp.ClientSession, tenant: Tenant,
+                            state: TenantState,
+                            semaphore: asyncio.Semaphore,
+                            store: StateStore = None) -> None:
+    """Один асинхронный цикл опроса API для получателя."""
+    async with semaphore:
+        response = await get_api_answer_async(
+            session, tenant.token, state.timestamp
+        )
+    changes = tenants.process_response(state, response, store)
+    for message in homework.build_messages(changes):
+        await fan_out(session, tenant.chat_ids, message)
+
+
+def startup_spread(count: int, rate: float = START_RATE) -> float:
+    """Интервал, по которому разносятся первые запросы count получателей.
+
+    Пока получателей не больше, чем запросов в секунду `rate`, первые
+    опросы идут сразу; дальше — не быстрее `rate` и не дольше
+    обычного интервала опроса.
+    """
+    if count <= rate:
+        return 0.0
+    return min(count / rate, homework.RETRY_TIME)
+
+
+async def tenant_loop(session: aiohttp.ClientSession, tenant: Tenant,
+                      state: TenantState,
+                      semaphore: asyncio.Semaphore,
+                      store: StateStore = None,
+                      spread: float = 0.0) -> None:
+    """Бесконечный цикл опроса одного получателя."""
+    # Разносим первые запросы, чтобы не бить API залпом.
+    if spread:
+        await asyncio.sleep(random.uniform(0, spread))
+    while True:
+        try:
+            await poll_tenant_async(session, tenant, state, semaphore, store)
+        except LogError as error:
+            logging.error(error)
+        except Exception as error:
+            if isinstance(error, APIError):
+                state.schedule.record_failure()
+            logging.error(error)
+            notice = tenants.error_notice(state, error)
+            if notice is not None:
+                await notify_async(session, tenant, notice)
+        else:
+            notice = tenants.recovery_notice(state)
+            if notice is not None:
+                await notify_async(session, tenant, notice)
+        if startup.report.mark('first_poll'):
+            logging.info(startup.report.summary())
+        await asyncio.sleep(state.schedule.next_delay())
+
+
+async def flush_periodically(store: StateStore,
+                             interval: float = FLUSH_INTERVAL) -> None:
+    """Периодическая запись накопленного состояния на диск."""
+    while True:
+        await asyncio.sleep(interval)
+        store.flush()
+
+
+async def run(states: Dict[Tenant, TenantState],
+              max_in_flight: int = MAX_IN_FLIGHT,
+              store: StateStore = None) -> None:
+    """Запуск опроса всех получателей в одном событийном цикле."""
+    semaphore = asyncio.Semaphore(max_in_flight)
+    connector = aiohttp.TCPConnector(limit=max_in_flight)
+    timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+    async with aiohttp.ClientSession(
+        connector=connector, timeout=timeout
+    ) as session:
+        spread = startup_spread(len(states))
+        loops = [
+            tenant_loop(session, tenant, state, semaphore, store, spread)
+            for tenant, state in states.items()
+        ]
+        if store is not None:
+            loops.append(flush_periodically(store))
+        await asyncio.gather(*loops)
+
+
+def main(path: str = None) -> None:
+    """Асинхронный режим работы бота."""
+    homework.setup_logging()
+    homework.check_message_settings()
+    path = path or os.getenv('TENANTS_FILE')
+
+    if path and homework.TELEGRAM_TOKEN:
+        registry = tenants.load_tenants(path)
+    elif homework.check_tokens():
+        registry = [
+            Tenant(homework.PRACTICUM_TOKEN, (homework.TELEGRAM_CHAT_ID,))
+        ]
+    else:
+        logging.critical('Ошибка с инициализацией Токенов.')
+        sys.exit('Ошибка, токены не заданы или заданы, но неправильно.')
+
+    if homework.METRICS_PORT:
+        metrics.serve(homework.METRICS_PORT)
+    store = StateStore(homework.STATE_FILE)
+    states = tenants.init_states(
+        registry, policy_from_env(homework.RETRY_TIME), store
+    )
+    startup.report.mark('config')
+    try:
+        asyncio.run(run(states, store=store))
+    finally:
+        store.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+import logging
+import threading
+from collections import defaultdict
+from typing import Dict, List
+
+from exceptions import LogError
+
+
+TELEGRAM_MESSAGE_LIMIT = 4096
+SEPARATOR = '\n\n'
+ENTITY_MAX = 10
+
+
+def split_point(message: str, start: int, limit: int) -> int:
+    """Конец куска: по пробелу, а без него — не внутри экранирования.
+
+    Экранированный текст нельзя резать посреди экранированного
+    символа или `&lt;`, иначе телеграм отклонит кусок с разметкой.
+    """
+    end = start + limit
+    if end >= len(message):
+        return len(message)
+    space = max(
+        message.rfind('\n', start, end), message.rfind(' ', start, end)
+    )
+    if space > start:
+        return space + 1
+    backslashes = end - len(message[start:end].rstrip('\\')) - start
+    if backslashes % 2 and end - 1 > start:
+        end -= 1
+    entity = message.rfind('&', max(start, end - ENTITY_MAX), end)
+    if entity > start and ';' not in message[entity:end]:
+        end = entity
+    return end
+
+
+def split_message(message: str,
+                  limit: int = TELEGRAM_MESSAGE_LIMIT) -> List[str]:
+    """Нарезка слишком длинного сообщения на куски не длиннее лимита."""
+    if len(message) <= limit:
+        return [message]
+    chunks = []
+    start = 0
+    while start < len(message):
+        end = split_point(message, start, limit)
+        chunks.append(message[start:end])
+        start = end
+    return chunks
+
+
+def coalesce(messages: List[str],
+             limit: int = TELEGRAM_MESSAGE_LIMIT) -> List[str]:
+    """Склейка уведомлений в минимум сообщений не длиннее лимита."""
+    batches = []
+    current = []
+    size = 0
+    for message in messages:
+        for chunk in split_message(message, limit):
+            extra = len(chunk) + (len(SEPARATOR) if current else 0)
+            if current and size + extra > limit:
+                batches.append(SEPARATOR.join(current))
+                current = []
+                extra = len(chunk)
+                size = 0
+            current.append(chunk)
+            size += extra
+    if current:
+        batches.append(SEPARATOR.join(current))
+    return batches
+
+
+class Coalescer:
+    """Сборщик уведомлений чата за короткое окно в одно сообщение.
+
+    Первое сообщение в чат запускает таймер на `window` секунд, всё,
+    что придёт за это время, уходит одной отправкой через `coalesce`.
+    """
+
+    def __init__(self, bot, window: float) -> None:
+        """Запоминаем получателя отправок и длину окна."""
+        self.bot = bot
+        self.window = window
+        self.pending: Dict[str, List[str]] = defaultdict(list)
+        self.timers: Dict[str, threading.Timer] = {}
+        self.options: Dict[str, dict] = {}
+        self.lock = threading.Lock()
+
+    def send_message(self, chat_id: str, text: str, **kwargs) -> None:
+        """Добавление сообщения в окно чата."""
+        with self.lock:
+            self.pending[chat_id].append(text)
+            self.options[chat_id] = kwargs
+            if chat_id not in self.timers:
+                timer = threading.Timer(
+                    self.window, self.flush, args=(chat_id,)
+                )
+                timer.daemon = True
+                self.timers[chat_id] = timer
+                timer.start()
+
+    def flush(self, chat_id: str) -> None:
+        """Отправка накопленных сообщений чата."""
+        with self.lock:
+            messages = self.pending.pop(chat_id, [])
+            self.timers.pop(chat_id, None)
+            options = self.options.pop(chat_id, {})
+        for batch in coalesce(messages):
+            try:
+                self.bot.send_message(chat_id, text=batch, **options)
+            except LogError as error:
+                logging.error(error)
+
+    def close(self) -> None:
+        """Досрочная отправка всех окон и закрытие нижнего отправщика."""
+        with self.lock:
+            timers = list(self.timers.items())
+        for chat_id, timer in timers:
+            timer.cancel()
+            self.flush(chat_id)
+        if hasattr(self.bot, 'close'):
+            self.bot.close()
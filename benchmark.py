@@ -0,0 +1,226 @@
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import statistics
+import subprocess
+import multiprocessing
+from typing import Dict, List
+
+import homework
+import tenants
+from tenants import Tenant
+from circuit_breaker import CircuitBreaker
+from response_cache import ResponseCache
+from fake_servers import Event, FakePracticum, FakeTelegram
+
+
+SIZES = (1, 100, 1000, 10000)
+RESULTS_FILE = os.path.join(homework.BASE_DIR, 'benchmark.json')
+
+
+class DeliveryLog(FakeTelegram):
+    """Поддельный телеграм, запоминающий время доставки в каждый чат."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        """Журнал доставок изначально пуст."""
+        super().__init__(*args, **kwargs)
+        self.delivered: Dict[int, float] = {}
+
+    def handle(self, method: str, path: str, headers,
+               body: bytes) -> tuple:
+        """Ответ как у FakeTelegram плюс отметка времени доставки."""
+        status, data = super().handle(method, path, headers, body)
+        if data.get('ok'):
+            self.delivered[data['result']['chat']['id']] = time.time()
+        return status, data
+
+
+def serve_fakes(tokens: List[str], conn) -> None:
+    """Процесс с поддельными серверами, чтобы не искажать замер CPU."""
+    homework_event = Event(0, {
+        'id': 1, 'homework_name': 'benchmark', 'status': 'reviewing',
+        'reviewer_comment': 'Работа взята на проверку.'
+    })
+    practicum = FakePracticum(
+        {token: [homework_event] for token in tokens}
+    ).start()
+    telegram = DeliveryLog().start()
+    conn.send((practicum.endpoint, telegram.base_url))
+    conn.recv()
+    conn.send(telegram.delivered)
+    practicum.stop()
+    telegram.stop()
+
+
+def rss_mb() -> float:
+    """Текущий размер резидентной памяти процесса в МБ."""
+    try:
+        with open('/proc/self/status') as file:
+            for line in file:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def percentiles(values: List[float]) -> Dict[str, float]:
+    """p50, p95, p99 и максимум в миллисекундах."""
+    if not values:
+        return {}
+    if len(values) == 1:
+        values = values * 2
+    cuts = statistics.quantiles(values, n=100, method='inclusive')
+    return {
+        'p50': round(cuts[49] * 1000, 3),
+        'p95': round(cuts[94] * 1000, 3),
+        'p99': round(cuts[98] * 1000, 3),
+        'max': round(max(values) * 1000, 3),
+    }
+
+
+def poll_round(bot, states: Dict[Tenant, tenants.TenantState],
+               started_at: Dict[int, float] = None) -> float:
+    """Один опрос всех получателей, возвращает затраченное время."""
+    started = time.perf_counter()
+    for tenant, state in states.items():
+        if started_at is not None:
+            started_at[tenant.chat_ids[0]] = time.time()
+        response = homework.request_homeworks(tenant.token, state.timestamp)
+        changes = tenants.process_response(state, response)
+        for message in homework.build_messages(changes):
+            for chat_id in tenant.chat_ids:
+                homework.send_message_to(bot, chat_id, message)
+    return time.perf_counter() - started
+
+
+def run_scenario(count: int) -> dict:
+    """Замер конвейера опроса для count получателей.
+
+    Первый круг опроса находит у каждого получателя изменение статуса
+    и отправляет уведомление, второй — холостой, без изменений.
+    Задержка уведомления считается от начала запроса к API до приёма
+    сообщения поддельным телеграмом, без учёта интервала опроса.
+    Кэш ответов и предохранитель на время замера свои, чтобы
+    предыдущий сценарий с теми же токенами не влиял на результат.
+    """
+    from telegram import Bot
+
+    registry = [Tenant(f'token-{index}', (index,)) for index in range(count)]
+    parent, child = multiprocessing.Pipe()
+    server = multiprocessing.Process(
+        target=serve_fakes, args=([t.token for t in registry], child),
+        daemon=True
+    )
+    server.start()
+    endpoint, base_url = parent.recv()
+
+    client = homework.api_client
+    previous = (client.endpoint, client.breaker, client.cache)
+    client.endpoint = endpoint
+    client.breaker = CircuitBreaker(
+        homework.BREAKER_FAILURES, homework.BREAKER_RESET
+    )
+    client.cache = ResponseCache() if client.cache is not None else None
+    client.open()
+    try:
+        bot = Bot('1234:benchmark', base_url=base_url)
+        states = tenants.init_states(registry)
+        for state in states.values():
+            state.timestamp = 0
+
+        started_at: Dict[int, float] = {}
+        cpu = time.process_time()
+        notify_elapsed = poll_round(bot, states, started_at)
+        idle_elapsed = poll_round(bot, states)
+        cpu = time.process_time() - cpu
+        memory = rss_mb()
+    finally:
+        client.close()
+        client.endpoint, client.breaker, client.cache = previous
+        parent.send('stop')
+        delivered = parent.recv()
+        server.join()
+
+    latencies = [
+        delivered[chat_id] - started
+        for chat_id, started in started_at.items() if chat_id in delivered
+    ]
+    return {
+        'tenants': count,
+        'polls_per_sec': round(count / idle_elapsed, 1),
+        'notify_polls_per_sec': round(count / notify_elapsed, 1),
+        'cpu_ms_per_poll': round(cpu * 1000 / (2 * count), 3),
+        'notification_latency_ms': percentiles(latencies),
+        'delivered': len(latencies),
+        'rss_mb': round(memory, 1),
+    }
+
+
+def revision() -> str:
+    """Версия кода, на которой сделан замер."""
+    try:
+        return subprocess.run(
+            ['git', 'describe', '--always', '--dirty'],
+            cwd=homework.BASE_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def compare(result: dict, baseline: dict) -> List[str]:
+    """Строки с изменением пропускной способности и p99 к базовому замеру."""
+    previous = {
+        scenario['tenants']: scenario for scenario in baseline['scenarios']
+    }
+    lines = []
+    for scenario in result['scenarios']:
+        old = previous.get(scenario['tenants'])
+        if old is None:
+            continue
+        speed = scenario['polls_per_sec'] / old['polls_per_sec'] - 1
+        p99 = scenario['notification_latency_ms'].get('p99', 0)
+        old_p99 = old['notification_latency_ms'].get('p99', 0)
+        lines.append(
+            f'{scenario["tenants"]} получателей: опросы/с {speed:+.1%}, '
+            f'p99 {old_p99} → {p99} мс'
+        )
+    return lines
+
+
+def main(argv: List[str] = None) -> None:
+    """Запуск замеров и сохранение результатов в JSON."""
+    parser = argparse.ArgumentParser(
+        description='Замер производительности конвейера опроса.'
+    )
+    parser.add_argument('--tenants', type=int, nargs='+', default=SIZES)
+    parser.add_argument('--output', default=RESULTS_FILE)
+    parser.add_argument('--baseline', help='JSON предыдущего замера')
+    args = parser.parse_args(argv)
+
+    result = {
+        'revision': revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'created': int(time.time()),
+        'scenarios': [],
+    }
+    for count in args.tenants:
+        scenario = run_scenario(count)
+        result['scenarios'].append(scenario)
+        print(json.dumps(scenario, ensure_ascii=False))
+
+    with open(args.output, 'w', encoding='utf-8') as file:
+        json.dump(result, file, ensure_ascii=False, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as file:
+            print('\n'.join(compare(result, json.load(file))))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
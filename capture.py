@@ -0,0 +1,132 @@
+import sys
+import json
+import time
+import argparse
+import threading
+from collections import Counter
+from typing import Callable, Dict, Iterator, List
+
+from exceptions import LogError
+
+
+class TrafficRecorder:
+    """Запись запросов к API и отправок в телеграм в NDJSON.
+
+    Каждая строка — один обмен с отметкой времени. Вместо токена
+    пишется его хеш `state_key`, сам токен в файл не попадает.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Файл открывается на дозапись."""
+        self.path = path
+        self.file = open(path, 'a', encoding='utf-8')
+        self.lock = threading.Lock()
+
+    def write(self, record: dict) -> None:
+        """Запись одной строки."""
+        line = json.dumps(record, ensure_ascii=False)
+        with self.lock:
+            self.file.write(line + '\n')
+            self.file.flush()
+
+    def record_api(self, request: Callable[[str, int], dict],
+                   token: str, from_date: int) -> dict:
+        """Запрос к API с записью ответа или ошибки."""
+        from state_store import state_key
+
+        record = {
+            'ts': time.time(), 'kind': 'api',
+            'tenant': state_key(token), 'from_date': from_date,
+        }
+        started = time.perf_counter()
+        try:
+            response = request(token, from_date)
+        except Exception as error:
+            record['error'] = f'{type(error).__name__}: {error}'
+            raise
+        else:
+            record['response'] = response
+            return response
+        finally:
+            record['elapsed'] = round(time.perf_counter() - started, 6)
+            self.write(record)
+
+    def record_send(self, chat_id: str, text: str,
+                    error: Exception = None) -> None:
+        """Запись отправки сообщения в чат."""
+        record = {
+            'ts': time.time(), 'kind': 'send',
+            'chat_id': str(chat_id), 'text': text,
+        }
+        if error is not None:
+            record['error'] = f'{type(error).__name__}: {error}'
+        self.write(record)
+
+    def close(self) -> None:
+        """Закрытие файла записи."""
+        self.file.close()
+
+
+def read_capture(path: str) -> Iterator[dict]:
+    """Записи из NDJSON по одной, пустые строки пропускаются."""
+    with open(path, encoding='utf-8') as file:
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
+
+
+def replay(records: Iterator[dict], speed: float = 0.0) -> dict:
+    """Прогон записанных ответов API через проверку и сборку сообщений.
+
+    Для каждого получателя ведётся своё состояние, как при обычном
+    опросе. speed — ускорение относительно записи, 0 — без пауз.
+    """
+    import homework
+    import tenants
+
+    states: Dict[str, tenants.TenantState] = {}
+    stats = Counter()
+    errors = Counter()
+    previous = None
+    started = time.perf_counter()
+    for record in records:
+        if speed and previous is not None:
+            time.sleep(max(record['ts'] - previous, 0) / speed)
+        previous = record['ts']
+        stats[record['kind']] += 1
+        if record['kind'] != 'api' or 'response' not in record:
+            continue
+        state = states.setdefault(
+            record['tenant'], tenants.TenantState(record['tenant'], 0)
+        )
+        try:
+            changes = tenants.process_response(state, record['response'])
+            stats['messages'] += len(homework.build_messages(changes))
+        except (LogError, KeyError, TypeError) as error:
+            errors[f'{type(error).__name__}: {error}'] += 1
+    return {
+        'records': sum(stats[kind] for kind in ('api', 'send')),
+        'responses': stats['api'],
+        'captured_sends': stats['send'],
+        'messages': stats['messages'],
+        'tenants': len(states),
+        'errors': dict(errors),
+        'elapsed': round(time.perf_counter() - started, 3),
+    }
+
+
+def main(argv: List[str] = None) -> None:
+    """Воспроизведение записи трафика и вывод сводки."""
+    parser = argparse.ArgumentParser(
+        description='Воспроизведение записанного трафика бота.'
+    )
+    parser.add_argument('capture', help='NDJSON, записанный с CAPTURE_FILE')
+    parser.add_argument('--speed', type=float, default=0.0,
+                        help='ускорение относительно записи, 0 — без пауз')
+    args = parser.parse_args(argv)
+    summary = replay(read_capture(args.capture), args.speed)
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,64 @@
+import time
+import threading
+
+from exceptions import CircuitOpenError
+
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half-open'
+
+
+class CircuitBreaker:
+    """Предохранитель для внешнего API: closed → open → half-open.
+
+    После failure_threshold сбоев подряд запросы перестают уходить
+    на recovery_timeout секунд. Затем пропускается не более
+    half_open_probes пробных запросов: успех закрывает цепь, сбой
+    снова размыкает её.
+    """
+
+    def __init__(self, failure_threshold: int = 5,
+                 recovery_timeout: float = 60,
+                 half_open_probes: int = 1) -> None:
+        """Цепь изначально замкнута."""
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_probes = half_open_probes
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probes = 0
+        self.lock = threading.Lock()
+
+    def before_call(self) -> None:
+        """Проверка перед запросом, при разомкнутой цепи — исключение."""
+        with self.lock:
+            if self.state == OPEN:
+                if time.monotonic() - self.opened_at < self.recovery_timeout:
+                    raise CircuitOpenError(
+                        'API недоступно, опрос пропущен предохранителем.'
+                    )
+                self.state = HALF_OPEN
+                self.probes = 0
+            if self.state == HALF_OPEN:
+                if self.probes >= self.half_open_probes:
+                    raise CircuitOpenError(
+                        'API проверяется пробным запросом, опрос пропущен.'
+                    )
+                self.probes += 1
+
+    def record_success(self) -> None:
+        """Учёт успешного ответа: цепь замыкается."""
+        with self.lock:
+            self.state = CLOSED
+            self.failures = 0
+
+    def record_failure(self) -> None:
+        """Учёт сбоя API."""
+        with self.lock:
+            self.failures += 1
+            if (self.state == HALF_OPEN
+                    or self.failures >= self.failure_threshold):
+                self.state = OPEN
+                self.opened_at = time.monotonic()
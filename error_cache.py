@@ -0,0 +1,93 @@
+import re
+import time
+from typing import Dict, Optional, Tuple
+
+
+SUMMARY_INTERVAL = 6 * 60 * 60
+TTL = 24 * 60 * 60
+ADDRESS = re.compile(r' at 0x[0-9a-fA-F]+')
+
+
+def error_key(error: Exception) -> Tuple[str, str]:
+    """Ключ ошибки без деталей, меняющихся от раза к разу.
+
+    APIError оборачивает исключение requests, в тексте которого есть
+    адрес объекта соединения, поэтому вместо вложенного исключения
+    берётся его тип, а адреса вырезаются из текста.
+    """
+    parts = []
+    for arg in error.args:
+        if isinstance(arg, BaseException):
+            parts.append(type(arg).__name__)
+        else:
+            parts.append(ADDRESS.sub('', str(arg)))
+    return type(error).__name__, ' '.join(parts)
+
+
+class ErrorEntry:
+    """Учёт одной повторяющейся ошибки."""
+
+    __slots__ = ('last_seen', 'last_notified', 'count')
+
+    def __init__(self, now: float) -> None:
+        """Первое появление ошибки уже отправлено в чат."""
+        self.last_seen = now
+        self.last_notified = now
+        self.count = 0
+
+
+class ErrorCache:
+    """Подавление повторных уведомлений об одной и той же ошибке.
+
+    Ключ — тип исключения и его нормализованный текст (`error_key`).
+    В чат уходит первое появление, затем не чаще раза в
+    summary_interval сводка с числом повторов, а после
+    восстановления — сообщение о том, что всё работает.
+    """
+
+    __slots__ = ('summary_interval', 'ttl', 'entries')
+
+    def __init__(self, summary_interval: float = SUMMARY_INTERVAL,
+                 ttl: float = TTL) -> None:
+        """Кэш изначально пуст."""
+        self.summary_interval = summary_interval
+        self.ttl = ttl
+        self.entries: Dict[Tuple[str, str], ErrorEntry] = {}
+
+    def record(self, error: Exception,
+               now: float = None) -> Optional[str]:
+        """Учёт ошибки, возвращает текст уведомления, если оно нужно."""
+        now = time.time() if now is None else now
+        self.expire(now)
+        key = error_key(error)
+        entry = self.entries.get(key)
+        if entry is None:
+            self.entries[key] = ErrorEntry(now)
+            return f'Cбой в программе {error} \U0001F4CC'
+        entry.count += 1
+        entry.last_seen = now
+        if now - entry.last_notified < self.summary_interval:
+            return None
+        hours = round((now - entry.last_notified) / 3600)
+        message = (
+            f'Cбой в программе {error} повторился {entry.count} раз '
+            f'за последние {hours} ч. \U0001F4CC'
+        )
+        entry.last_notified = now
+        entry.count = 0
+        return message
+
+    def recover(self) -> Optional[str]:
+        """Сообщение о восстановлении, если до этого были ошибки."""
+        if not self.entries:
+            return None
+        self.entries.clear()
+        return 'Работа бота восстановлена. \U00002705'
+
+    def expire(self, now: float) -> None:
+        """Удаление ошибок, которые давно не повторялись."""
+        for key in [
+            key for key, entry in self.entries.items()
+            if now - entry.last_seen > self.ttl
+        ]:
+            del self.entries[key]
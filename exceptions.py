@@ -20,3 +20,9 @@ class APIError(ConnectionError):
     """Ошибка вызова response."""
 
     pass
+
+
+class CircuitOpenError(LogError):
+    """API временно недоступно, запрос пропущен предохранителем."""
+
+    pass
@@ -0,0 +1,218 @@
+import os
+import sys
+import csv
+import json
+import logging
+import argparse
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import IO, Dict, Iterable, List, Set
+
+import homework
+import tenants
+from tenants import Tenant
+from homework_record import HomeworkRecord
+from homework_stream import until_watermark
+from state_store import StateStore, state_key
+
+
+FORMATS = ('ndjson', 'csv')
+FIELDS = ('tenant',) + HomeworkRecord._fields
+CONCURRENCY = 4
+SPOOL_SIZE = 1024 * 1024
+COPY_CHUNK = 64 * 1024
+
+
+class Exporter:
+    """Выгрузка истории работ получателей в NDJSON или CSV.
+
+    История каждого получателя сначала пишется во временный файл,
+    затем целиком дописывается в итоговый, после чего в контрольную
+    точку заносится получатель и размер выгрузки. При повторном запуске
+    выгрузка обрезается до последней контрольной точки, а уже
+    выгруженные получатели пропускаются. Непустой файл без контрольной
+    точки перезаписывается только при overwrite. Если переданы
+    метки времени получателей, выгружаются только работы новее метки,
+    и чтение истории прекращается на первой более старой.
+    """
+
+    def __init__(self, path: str, fmt: str = 'ndjson',
+                 checkpoint: str = None, overwrite: bool = False,
+                 watermarks: Dict[str, int] = None) -> None:
+        """Файл выгрузки, формат, контрольная точка и метки времени."""
+        if fmt not in FORMATS:
+            raise ValueError(f'Неизвестный формат выгрузки {fmt}.')
+        self.path = path
+        self.fmt = fmt
+        self.checkpoint = checkpoint or f'{path}.checkpoint'
+        self.watermarks = watermarks or {}
+        self.lock = threading.Lock()
+        if overwrite:
+            self.reset()
+        self.done = self.resume()
+        self.output = open(path, 'ab')
+
+    def reset(self) -> None:
+        """Удаление прежней выгрузки и её контрольной точки."""
+        for path in (self.path, self.checkpoint):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def resume(self) -> Set[str]:
+        """Получатели из контрольной точки; хвост выгрузки отбрасывается."""
+        size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        if not os.path.exists(self.checkpoint):
+            if size:
+                raise FileExistsError(
+                    f'{self.path} уже существует, а контрольной точки '
+                    f'{self.checkpoint} нет.'
+                )
+            return set()
+        done, offset = set(), 0
+        with open(self.checkpoint, encoding='utf-8') as file:
+            for line in file:
+                if line.strip():
+                    entry = json.loads(line)
+                    done.add(entry['tenant'])
+                    offset = entry['offset']
+        if size > offset:
+            os.truncate(self.path, offset)
+        return done
+
+    def write_records(self, spool: IO[str], key: str,
+                      records: Iterable[HomeworkRecord]) -> int:
+        """Запись работ получателя во временный файл."""
+        writer = csv.writer(spool) if self.fmt == 'csv' else None
+        count = 0
+        for record in records:
+            if writer is not None:
+                writer.writerow((key,) + tuple(record))
+            else:
+                data = dict(zip(FIELDS, (key,) + tuple(record)))
+                spool.write(json.dumps(data, ensure_ascii=False) + '\n')
+            count += 1
+        return count
+
+    def commit(self, key: str, spool: IO[str]) -> None:
+        """Перенос истории получателя в выгрузку и контрольную точку."""
+        spool.seek(0)
+        with self.lock:
+            # Заголовок CSV пишется вместе с первой историей, чтобы не
+            # оставлять без контрольной точки файл из одного заголовка.
+            if self.fmt == 'csv' and self.output.tell() == 0:
+                self.output.write((','.join(FIELDS) + '\r\n').encode())
+            for chunk in iter(lambda: spool.read(COPY_CHUNK), ''):
+                self.output.write(chunk.encode())
+            self.output.flush()
+            os.fsync(self.output.fileno())
+            entry = {'tenant': key, 'offset': self.output.tell()}
+            with open(self.checkpoint, 'a', encoding='utf-8') as file:
+                file.write(json.dumps(entry) + '\n')
+            self.done.add(key)
+
+    def export_tenant(self, tenant: Tenant) -> int:
+        """Полная история одного получателя, возвращает число работ."""
+        key = state_key(tenant.token)
+        with tempfile.SpooledTemporaryFile(
+            SPOOL_SIZE, mode='w+', encoding='utf-8', newline=''
+        ) as spool:
+            with homework.api_client.stream_homeworks(tenant.token) as stream:
+                records = stream
+                if key in self.watermarks:
+                    records = until_watermark(stream, self.watermarks[key])
+                count = self.write_records(spool, key, records)
+            self.commit(key, spool)
+        logging.info(f'Выгружено работ получателя {key}: {count}.')
+        return count
+
+    def run(self, registry: List[Tenant],
+            concurrency: int = CONCURRENCY) -> int:
+        """Выгрузка всех получателей, возвращает число неудачных."""
+        pending = [
+            tenant for tenant in registry
+            if state_key(tenant.token) not in self.done
+        ]
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = {
+                executor.submit(self.export_tenant, tenant): tenant
+                for tenant in pending
+            }
+        failed = 0
+        for future, tenant in futures.items():
+            error = future.exception()
+            if error is not None:
+                failed += 1
+                logging.error(
+                    f'Не удалось выгрузить {state_key(tenant.token)}: {error}'
+                )
+        return failed
+
+    def close(self) -> None:
+        """Закрытие файла выгрузки."""
+        self.output.close()
+
+
+def load_watermarks(registry: List[Tenant], path: str) -> Dict[str, int]:
+    """Сохранённые ботом метки времени получателей реестра."""
+    store = StateStore(path)
+    try:
+        watermarks = {}
+        for tenant in registry:
+            key = state_key(tenant.token)
+            watermark = store.load(key)
+            if watermark is not None:
+                watermarks[key] = watermark
+        return watermarks
+    finally:
+        store.close()
+
+
+def main(argv: List[str] = None) -> int:
+    """Выгрузка истории работ из командной строки."""
+    parser = argparse.ArgumentParser(
+        description='Выгрузка полной истории домашних работ.'
+    )
+    parser.add_argument('output', help='файл выгрузки')
+    parser.add_argument('--format', choices=FORMATS, default='ndjson')
+    parser.add_argument('--concurrency', type=int, default=CONCURRENCY)
+    parser.add_argument('--checkpoint', help='файл контрольной точки')
+    parser.add_argument('--overwrite', action='store_true',
+                        help='начать выгрузку заново, удалив прежнюю')
+    parser.add_argument('--tenants', default=os.getenv('TENANTS_FILE'),
+                        help='реестр получателей, по умолчанию TENANTS_FILE')
+    parser.add_argument('--since-state', action='store_true',
+                        help='только работы новее меток из STATE_FILE')
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    if args.tenants:
+        registry = tenants.load_tenants(args.tenants)
+    elif homework.PRACTICUM_TOKEN:
+        registry = [Tenant(homework.PRACTICUM_TOKEN, ())]
+    else:
+        parser.error('не задан реестр получателей или TOKEN_YANDEX')
+
+    watermarks = None
+    if args.since_state:
+        watermarks = load_watermarks(registry, homework.STATE_FILE)
+    try:
+        exporter = Exporter(
+            args.output, args.format, args.checkpoint, args.overwrite,
+            watermarks
+        )
+    except FileExistsError as error:
+        parser.error(f'{error} Укажите --overwrite или --checkpoint.')
+    homework.api_client.open()
+    try:
+        failed = exporter.run(registry, args.concurrency)
+    finally:
+        exporter.close()
+        homework.api_client.close()
+    if failed:
+        print(f'Не выгружено получателей: {failed}, повторите запуск.')
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,327 @@
+import sys
+import json
+import time
+import random
+import socket
+import logging
+import argparse
+import threading
+from collections import deque, namedtuple
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, List, Optional, Union
+from urllib.parse import parse_qs, urlsplit
+
+
+DROP = 'drop'
+
+Event = namedtuple('Event', ('at', 'homework'))
+Event.__doc__ = 'Изменение статуса работы через at секунд после старта.'
+
+Fault = Union[int, str]
+SERVER_ERROR = HTTPStatus.INTERNAL_SERVER_ERROR
+POLL_INTERVAL = 0.05
+
+
+class Faults:
+    """Сценарий сбоев: сначала заданные по порядку, затем случайные.
+
+    Сбой — код ответа (500, 429 и т.п.) или DROP, при котором сервер
+    закрывает соединение, не ответив.
+    """
+
+    def __init__(self, script: Iterable[Fault] = (), rate: float = 0.0,
+                 choices: Iterable[Fault] = (SERVER_ERROR,),
+                 seed: int = None) -> None:
+        """Сценарий, доля случайных сбоев и их возможные виды."""
+        self.script = deque(script)
+        self.rate = rate
+        self.choices = list(choices)
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+
+    def next(self) -> Optional[Fault]:
+        """Сбой для очередного запроса или None."""
+        with self.lock:
+            if self.script:
+                return self.script.popleft()
+            if self.rate and self.random.random() < self.rate:
+                return self.random.choice(self.choices)
+        return None
+
+
+class FakeServer:
+    """Общая часть поддельных серверов: поток, задержка и сбои."""
+
+    def __init__(self, port: int = 0, latency: float = 0.0,
+                 faults: Faults = None, host: str = '127.0.0.1') -> None:
+        """Сервер слушает порт сразу, запросы принимает после start."""
+        self.latency = latency
+        self.faults = faults or Faults()
+        self.requests = 0
+        self.lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), self.handler_class())
+        self.httpd.daemon_threads = True
+        self.thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Адрес сервера."""
+        host, port = self.httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self) -> 'FakeServer':
+        """Обработка запросов в фоновом потоке."""
+        self.thread = threading.Thread(
+            target=self.httpd.serve_forever, name=type(self).__name__,
+            kwargs={'poll_interval': POLL_INTERVAL}, daemon=True
+        )
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Остановка сервера и освобождение порта."""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> 'FakeServer':
+        """Запуск в блоке with."""
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        """Остановка при выходе из блока with."""
+        self.stop()
+
+    def handle(self, method: str, path: str, headers,
+               body: bytes) -> tuple:
+        """Ответ на запрос: код и JSON; переопределяется наследниками."""
+        raise NotImplementedError
+
+    def fault_response(self, fault: int) -> dict:
+        """Тело ответа при сбое с кодом fault."""
+        return {'code': 'fault', 'message': f'Injected {fault}.'}
+
+    def handler_class(self) -> type:
+        """Класс обработчика, привязанный к этому серверу."""
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # Заголовки и тело пишутся отдельно, без этого keep-alive
+            # соединение ловит задержку Nagle и отложенного ACK в 40 мс.
+            disable_nagle_algorithm = True
+
+            def do_GET(self) -> None:
+                self.dispatch('GET')
+
+            def do_POST(self) -> None:
+                self.dispatch('POST')
+
+            def dispatch(self, method: str) -> None:
+                length = int(self.headers.get('Content-Length') or 0)
+                body = self.rfile.read(length) if length else b''
+                with server.lock:
+                    server.requests += 1
+                if server.latency:
+                    time.sleep(server.latency)
+                fault = server.faults.next()
+                if fault == DROP:
+                    self.close_connection = True
+                    self.connection.shutdown(socket.SHUT_RDWR)
+                    return
+                if fault is not None:
+                    status, data = fault, server.fault_response(fault)
+                else:
+                    status, data = server.handle(
+                        method, self.path, self.headers, body
+                    )
+                payload = json.dumps(data, ensure_ascii=False).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format: str, *args) -> None:
+                logging.debug(format % args)
+
+        return Handler
+
+
+class FakePracticum(FakeServer):
+    """Поддельный эндпоинт homework_statuses со сценарием статусов.
+
+    timeline задаёт для каждого токена события `Event`; ответ содержит
+    последнее состояние работ, изменившихся после from_date, как это
+    делает настоящий API.
+    """
+
+    def __init__(self, timeline: Dict[str, List[Event]], port: int = 0,
+                 latency: float = 0.0, faults: Faults = None,
+                 clock: Callable[[], float] = time.time) -> None:
+        """Время событий отсчитывается от момента создания сервера."""
+        super().__init__(port, latency, faults)
+        self.clock = clock
+        self.started = clock()
+        self.timeline = {
+            token: sorted(events, key=lambda event: event.at)
+            for token, events in timeline.items()
+        }
+
+    @property
+    def endpoint(self) -> str:
+        """Адрес для PRACTICUM_ENDPOINT."""
+        return f'{self.url}/api/user_api/homework_statuses/'
+
+    def homeworks(self, token: str, from_date: int, now: float) -> List[dict]:
+        """Последние состояния работ, изменённых в (from_date, now]."""
+        latest = {}
+        for event in self.timeline[token]:
+            updated = self.started + event.at
+            if updated > now:
+                break
+            if updated > from_date:
+                key = event.homework.get('id', event.homework.get(
+                    'homework_name'
+                ))
+                latest[key] = dict(
+                    event.homework,
+                    date_updated=time.strftime(
+                        '%Y-%m-%dT%H:%M:%SZ', time.gmtime(updated)
+                    )
+                )
+        return sorted(
+            latest.values(), key=lambda hw: hw['date_updated'], reverse=True
+        )
+
+    def handle(self, method: str, path: str, headers,
+               body: bytes) -> tuple:
+        """Ответ в формате API Практикума."""
+        token = (headers.get('Authorization') or '').replace('OAuth ', '')
+        if token not in self.timeline:
+            return HTTPStatus.UNAUTHORIZED, {
+                'code': 'not_authenticated',
+                'message': 'Учетные данные не были предоставлены.',
+            }
+        query = parse_qs(urlsplit(path).query)
+        try:
+            from_date = int(query.get('from_date', ['0'])[0])
+        except ValueError:
+            return HTTPStatus.BAD_REQUEST, {
+                'code': 'UnknownError',
+                'error': {'error': 'Wrong from_date format'},
+            }
+        now = self.clock()
+        return HTTPStatus.OK, {
+            'homeworks': self.homeworks(token, from_date, now),
+            'current_date': int(now),
+        }
+
+
+class FakeTelegram(FakeServer):
+    """Поддельный Bot API телеграма: принимает sendMessage и запоминает."""
+
+    def __init__(self, port: int = 0, latency: float = 0.0,
+                 faults: Faults = None, retry_after: int = 1) -> None:
+        """retry_after — пауза, которую просит ответ 429."""
+        super().__init__(port, latency, faults)
+        self.retry_after = retry_after
+        self.sent: List[dict] = []
+
+    @property
+    def base_url(self) -> str:
+        """Адрес для TELEGRAM_API_URL."""
+        return f'{self.url}/bot'
+
+    def fault_response(self, fault: int) -> dict:
+        """Ошибка в формате Bot API, для 429 — с retry_after."""
+        data = {'ok': False, 'error_code': int(fault),
+                'description': f'Injected {fault}.'}
+        if fault == HTTPStatus.TOO_MANY_REQUESTS:
+            data['description'] = (
+                f'Too Many Requests: retry after {self.retry_after}'
+            )
+            data['parameters'] = {'retry_after': self.retry_after}
+        return data
+
+    def handle(self, method: str, path: str, headers,
+               body: bytes) -> tuple:
+        """Ответ на sendMessage в формате Bot API."""
+        if not urlsplit(path).path.endswith('/sendMessage'):
+            return HTTPStatus.NOT_FOUND, {
+                'ok': False, 'error_code': 404, 'description': 'Not Found'
+            }
+        if 'json' in (headers.get('Content-Type') or ''):
+            data = json.loads(body or b'{}')
+        else:
+            data = {
+                key: values[0]
+                for key, values in parse_qs(body.decode()).items()
+            }
+        with self.lock:
+            self.sent.append(data)
+            message_id = len(self.sent)
+        return HTTPStatus.OK, {'ok': True, 'result': {
+            'message_id': message_id,
+            'date': int(time.time()),
+            'chat': {'id': int(data.get('chat_id', 0)), 'type': 'private'},
+            'text': data.get('text', ''),
+        }}
+
+
+def load_timeline(path: str) -> Dict[str, List[Event]]:
+    """Сценарий из JSON: {токен: [{"at": секунды, ...работа}]}."""
+    with open(path, encoding='utf-8') as file:
+        data = json.load(file)
+    return {
+        token: [
+            Event(event.pop('at', 0), event) for event in events
+        ]
+        for token, events in data.items()
+    }
+
+
+def parse_faults(value: str) -> List[Fault]:
+    """Список сбоев из строки вида '500,429,drop'."""
+    return [
+        item if item == DROP else int(item)
+        for item in value.split(',') if item
+    ]
+
+
+def main(argv: List[str] = None) -> None:
+    """Запуск поддельных серверов до прерывания."""
+    parser = argparse.ArgumentParser(
+        description='Поддельные API Практикума и телеграма.'
+    )
+    parser.add_argument('timeline', help='JSON со сценарием статусов')
+    parser.add_argument('--practicum-port', type=int, default=8081)
+    parser.add_argument('--telegram-port', type=int, default=8082)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--fault-rate', type=float, default=0.0)
+    parser.add_argument('--faults', type=parse_faults, default='500',
+                        help='виды случайных сбоев, например 500,429,drop')
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    practicum = FakePracticum(
+        load_timeline(args.timeline), args.practicum_port, args.latency,
+        Faults(rate=args.fault_rate, choices=args.faults)
+    ).start()
+    telegram = FakeTelegram(
+        args.telegram_port, args.latency,
+        Faults(rate=args.fault_rate, choices=args.faults)
+    ).start()
+    print(f'PRACTICUM_ENDPOINT={practicum.endpoint}')
+    print(f'TELEGRAM_API_URL={telegram.base_url}')
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        practicum.stop()
+        telegram.stop()
+        sys.exit(0)
+
+
+if __name__ == '__main__':
+    main()
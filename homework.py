@@ -1,21 +1,31 @@
 import os
 import sys
-import time
 import logging
-import json
-from typing import List
-from http import HTTPStatus
+from typing import TYPE_CHECKING, List, Union
 
-import requests
-from telegram import Bot, TelegramError
 from dotenv import load_dotenv
 
-from exceptions import (
-    CheckResponseLogError,
-    LogError,
-    SendMessageError, APIError
-)
+import metrics
+import startup
+from capture import TrafficRecorder
+from exceptions import SendMessageError
+from homework_record import HomeworkRecord, make_record, parse_response
+from practicum_client import PracticumClient
+from response_cache import ResponseCache
+from rendering import EMOJI, Renderer, settings_error
+from circuit_breaker import CircuitBreaker
+from rate_limit import RateLimiter
+from batching import Coalescer, coalesce
+
+if TYPE_CHECKING:
+    from telegram import Bot
 
+if __name__ == '__main__':
+    # Скрипт работает с тем же модулем homework, что импортируют tenants
+    # и status_board, иначе клиент API, предохранитель и запись трафика
+    # создались бы дважды.
+    import homework
+    sys.exit(homework.cli(sys.argv[1:]))
 
 load_dotenv()
 
@@ -26,14 +36,57 @@ TELEGRAM_TOKEN = os.getenv('TELEGRAM_TOKEN')
 TELEGRAM_CHAT_ID = os.getenv('CHAT_ID')
 
 RETRY_TIME = 600
-ENDPOINT = 'https://practicum.yandex.ru/api/user_api/homework_statuses/'
+STATE_FILE = os.getenv('STATE_FILE', os.path.join(BASE_DIR, 'state.db'))
+ENDPOINT = os.getenv(
+    'PRACTICUM_ENDPOINT',
+    'https://practicum.yandex.ru/api/user_api/homework_statuses/'
+)
+TELEGRAM_API_URL = os.getenv(
+    'TELEGRAM_API_URL', 'https://api.telegram.org/bot'
+)
 HEADERS = {'Authorization': f'OAuth {PRACTICUM_TOKEN}'}
+OUTBOX_WORKERS = int(os.getenv('OUTBOX_WORKERS', 4))
+BATCH_WINDOW = float(os.getenv('BATCH_WINDOW', 0))
+STATUS_BOARD = os.getenv('STATUS_BOARD', '') == '1'
+API_POOL_SIZE = int(os.getenv('API_POOL_SIZE', 10))
+API_TIMEOUT = (
+    float(os.getenv('API_CONNECT_TIMEOUT', 3.05)),
+    float(os.getenv('API_READ_TIMEOUT', 10)),
+)
+BREAKER_FAILURES = int(os.getenv('BREAKER_FAILURES', 5))
+BREAKER_RESET = float(os.getenv('BREAKER_RESET', 60))
+RESPONSE_CACHE = os.getenv('RESPONSE_CACHE', '1') == '1'
+METRICS_PORT = int(os.getenv('METRICS_PORT', 0))
+CAPTURE_FILE = os.getenv('CAPTURE_FILE')
+LOG_FILE = os.getenv('LOG_FILE', os.path.join(BASE_DIR, 'main.log'))
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'text')
+LOG_ROTATE_WHEN = os.getenv('LOG_ROTATE_WHEN', '')
+LOG_MAX_BYTES = int(os.getenv('LOG_MAX_BYTES', 10 * 1024 * 1024))
+LOG_BACKUPS = int(os.getenv('LOG_BACKUPS', 5))
+
+MESSAGE_LOCALE = os.getenv('MESSAGE_LOCALE', 'ru')
+MESSAGE_PARSE_MODE = os.getenv('MESSAGE_PARSE_MODE') or None
+MESSAGE_SETTINGS_ERROR = settings_error(MESSAGE_LOCALE, MESSAGE_PARSE_MODE)
+
+# При ошибке в настройках модуль всё равно импортируется, чтобы
+# --check и точки входа могли сообщить о ней, а не упасть с KeyError.
+renderer = (
+    Renderer() if MESSAGE_SETTINGS_ERROR
+    else Renderer(MESSAGE_LOCALE, MESSAGE_PARSE_MODE)
+)
+SEND_OPTIONS = (
+    {'parse_mode': renderer.parse_mode} if renderer.parse_mode else {}
+)
+HOMEWORK_STATES = renderer.verdicts
 
-HOMEWORK_STATES = {
-    'approved': 'Работа проверена: ревьюеру всё понравилось. Ура!',
-    'reviewing': 'Работа взята на проверку ревьюером.',
-    'rejected': 'Работа проверена: у ревьюера есть замечания.'
-}
+api_breaker = CircuitBreaker(BREAKER_FAILURES, BREAKER_RESET)
+response_cache = ResponseCache() if RESPONSE_CACHE else None
+api_client = PracticumClient(
+    ENDPOINT, pool_size=API_POOL_SIZE, timeout=API_TIMEOUT,
+    breaker=api_breaker, cache=response_cache
+)
+recorder = TrafficRecorder(CAPTURE_FILE) if CAPTURE_FILE else None
+startup.report.mark('import')
 
 
 def check_tokens() -> bool:
@@ -41,139 +94,183 @@ def check_tokens() -> bool:
     return all((PRACTICUM_TOKEN, TELEGRAM_CHAT_ID, TELEGRAM_TOKEN))
 
 
-def get_api_answer(current_timestamp: int) -> dict:
-    """Получение ответа от API."""
-    params = {'from_date': current_timestamp}
+def check_message_settings() -> None:
+    """Остановка при неизвестном языке или режиме разметки."""
+    if MESSAGE_SETTINGS_ERROR:
+        logging.critical(MESSAGE_SETTINGS_ERROR)
+        sys.exit(f'Ошибка в настройках уведомлений. {MESSAGE_SETTINGS_ERROR}')
 
-    try:
-        response = requests.get(ENDPOINT, headers=HEADERS, params=params)
-        if response.status_code != HTTPStatus.OK:
-            raise APIError(
-                f'Сервер сервиса не дал ответа. {response.status_code}.'
+
+def request_homeworks(token: str, current_timestamp: int) -> dict:
+    """Получение ответа от API для конкретного токена."""
+    with metrics.track(metrics.API_REQUEST, metrics.API_ERRORS):
+        if recorder is not None:
+            return recorder.record_api(
+                api_client.get_homeworks, token, current_timestamp
             )
-        return response.json()
-    except requests.RequestException as error:
-        raise APIError(
-            error,
-            'Ошибка при получении ответа от API.'
-        )
+        return api_client.get_homeworks(token, current_timestamp)
 
 
-def check_response(response: dict) -> List[dict]:
-    """Проверка запроса к API."""
-    if not isinstance(response, dict):
-        raise TypeError('API вернуло не словарь.')
+def get_api_answer(current_timestamp: int) -> dict:
+    """Получение ответа от API."""
+    return request_homeworks(PRACTICUM_TOKEN, current_timestamp)
 
-    if 'homeworks' not in response.keys():
-        raise KeyError(
-            'В ответе API не были получены списки домашних работ.'
-        )
 
-    if not isinstance(response['homeworks'], list):
-        raise TypeError('Дз получено не в виде списка.')
+def check_response(response: dict) -> List[HomeworkRecord]:
+    """Проверка запроса к API и разбор работ в записи."""
+    with metrics.track(metrics.VALIDATE, metrics.VALIDATE_ERRORS):
+        return parse_response(response)
 
-    if 'current_date' not in response.keys():
-        raise CheckResponseLogError(
-            'В ответе API не была получена дата.'
-        )
 
-    if not isinstance(response['current_date'], int):
-        raise CheckResponseLogError(
-            'В ответе API была получена дата в неверном формате.'
-        )
+def parse_status(homework: Union[dict, HomeworkRecord]) -> str:
+    """Получение статуса проверки домашней работы."""
+    if isinstance(homework, dict):
+        homework = make_record(homework)
+    check_homework(homework)
+    return renderer.headline(homework)
 
-    return response['homeworks']
 
+def check_homework(homework: HomeworkRecord) -> None:
+    """Проверка, что у работы есть название и известный статус."""
+    if homework.homework_name is None:
+        raise KeyError('У девочки нет имени... ой, то-есть у дз.')
 
-def parse_status(homework: json) -> str:
-    """Получение статуса проверки домашней работы."""
-    homework_name = homework.get('homework_name')
-    homework_status = homework.get('status')
+    if homework.status not in HOMEWORK_STATES:
+        raise KeyError(f'{homework.status} - такого статуса нет.')
 
-    if homework_name is None:
-        raise KeyError('У девочки нет имени... ой, то-есть у дз.')
 
-    if homework_status not in HOMEWORK_STATES:
-        raise KeyError(f'{homework_status} - такого статуса нет.')
+def emoji(status: str) -> str:
+    """Возвращает для каждого статуса свой смайлик."""
+    return EMOJI[status]
 
-    verdict = HOMEWORK_STATES.get(homework_status)
 
-    return f'Изменился статус проверки работы "{homework_name}". {verdict}'
+def build_message(homework: HomeworkRecord) -> str:
+    """Сборка полного текста уведомления об изменении статуса."""
+    with metrics.track(metrics.RENDER, metrics.RENDER_ERRORS):
+        check_homework(homework)
+        return renderer.render(homework)
 
 
-def emoji(status: str) -> str:
-    """Возвращает для каждого статуса свой смайлик."""
-    emojis = {
-        'approved': '\U0001F4C8',
-        'reviewing': '\U0001F50D',
-        'rejected': '\U0001F6A8'
-    }
-    return emojis[status]
+def build_messages(changes: List[HomeworkRecord]) -> List[str]:
+    """Уведомления по всем изменившимся работам одним пакетом.
 
+    Работа без названия или с неизвестным статусом пропускается
+    с записью в лог, чтобы не терять уведомления об остальных.
+    """
+    valid = []
+    for record in changes:
+        try:
+            check_homework(record)
+        except KeyError as error:
+            metrics.RENDER_ERRORS.inc()
+            logging.error(f'Работа {record.key} пропущена: {error}')
+        else:
+            valid.append(record)
+    with metrics.track(metrics.RENDER, metrics.RENDER_ERRORS):
+        return coalesce(renderer.render_batch(valid))
+
+
+def send_message_to(bot: 'Bot', chat_id: str, message: str) -> None:
+    """Отправка сообщения в указанный чат."""
+    # Телеграм импортируется при первой отправке, а не при запуске.
+    from telegram import TelegramError
 
-def send_message(bot: Bot, message: dict) -> None:
-    """Отправка итогового сообщения со всей информацией."""
     try:
-        bot.send_message(TELEGRAM_CHAT_ID, text=message)
-    except TelegramError:
+        bot.send_message(chat_id, text=message, **SEND_OPTIONS)
+    except TelegramError as error:
+        if recorder is not None:
+            recorder.record_send(chat_id, message, error)
         raise SendMessageError('Ошибка в заимодействии с API ТГ.')
     else:
+        if recorder is not None:
+            recorder.record_send(chat_id, message)
         logging.info('Сообщение отправлено.')
 
 
-def main() -> None:
-    """Основная логика работы бота."""
-    logging.basicConfig(
-        level=logging.INFO,
-        filename=os.path.join(BASE_DIR, 'main.log'),
-        filemode='w',
-        format=(
-            'line:%(lineno)s \n'
-            'time:%(asctime)s \n'
-            'status:%(levelname)s \n'
-            'info:%(message)s \n')
+def send_message(bot: 'Bot', message: dict) -> None:
+    """Отправка итогового сообщения со всей информацией."""
+    send_message_to(bot, TELEGRAM_CHAT_ID, message)
+
+
+def create_sender(limiter: RateLimiter):
+    """Цепочка отправки: окно склейки, очередь, лимиты и сам бот."""
+    from outbox import Outbox
+
+    sender = Outbox(limiter, workers=OUTBOX_WORKERS)
+    if BATCH_WINDOW:
+        return Coalescer(sender, BATCH_WINDOW)
+    return sender
+
+
+def setup_logging(log_queue=None) -> None:
+    """Настройка неблокирующего логирования в файл с ротацией."""
+    from logging_setup import configure_logging
+
+    configure_logging(
+        LOG_FILE,
+        as_json=LOG_FORMAT == 'json',
+        when=LOG_ROTATE_WHEN or None,
+        max_bytes=LOG_MAX_BYTES,
+        backup_count=LOG_BACKUPS,
+        log_queue=log_queue,
     )
 
-    if not check_tokens():
-        logging.critical('Ошибка с инициализацией Токенов.')
-        sys.exit('Ошибка, токены не заданы или заданы, но неправильно.')
 
-    bot = Bot(token=TELEGRAM_TOKEN)
-    current_timestamp = int(time.time())
-    status = None
+def check_config() -> int:
+    """Проверка конфигурации без запуска бота и загрузки телеграма."""
+    if MESSAGE_SETTINGS_ERROR:
+        print(f'Ошибка в настройках уведомлений. {MESSAGE_SETTINGS_ERROR}')
+        return 1
+    path = os.getenv('TENANTS_FILE')
+    if path:
+        import tenants
 
-    while True:
         try:
-            response = get_api_answer(current_timestamp)
-            homework_list = check_response(response)
-            if len(homework_list) != 0:
-                homework_list = homework_list[0]
-                new_status = parse_status(homework_list)
-            else:
-                new_status = status
-
-            if status != new_status:
-                status = new_status
-                message = (
-                    f'{status} {emoji(homework_list["status"])} \n'
-                    f'Статус: {homework_list.get("status")} \U0001F6A9 \n'
-                    'Комментарий:'
-                    f'{homework_list.get("reviewer_comment")} \U0001F4DC'
-                )
-            current_timestamp = response['current_date']
-        except LogError as error:
-            logging.error(error)
-        except Exception as error:
-            message = f'Cбой в программе {error} \U0001F4CC'
-            logging.error(error)
-        else:
-            try:
-                send_message(bot, message)
-            except LogError as error:
-                logging.error(error, 'Не удалось отправить сообщение в ТГ')
-        finally:
-            time.sleep(RETRY_TIME)
+            registry = tenants.load_tenants(path)
+        except (OSError, ValueError, KeyError, TypeError) as error:
+            print(f'Ошибка в реестре получателей {path}: {error!r}')
+            return 1
+        if not TELEGRAM_TOKEN:
+            print('Не задан TELEGRAM_TOKEN.')
+            return 1
+        print(f'Реестр {path}: подписок {len(registry)}.')
+    elif not check_tokens():
+        print('Ошибка, токены не заданы или заданы, но неправильно.')
+        return 1
+    startup.report.mark('config')
+    print(startup.report.summary())
+    return 0
 
 
-if __name__ == '__main__':
-    main()
+def main() -> None:
+    """Основная логика работы бота."""
+    setup_logging()
+    check_message_settings()
+
+    if not check_tokens():
+        logging.critical('Ошибка с инициализацией Токенов.')
+        sys.exit('Ошибка, токены не заданы или заданы, но неправильно.')
+
+    import tenants
+    tenants.serve([tenants.Tenant(PRACTICUM_TOKEN, (TELEGRAM_CHAT_ID,))])
+
+
+def cli(argv: List[str]) -> int:
+    """Выбор режима работы по аргументам и переменным окружения."""
+    if '--check' in argv:
+        return check_config()
+    elif argv[:1] == ['--export']:
+        import export
+        return export.main(argv[1:])
+    elif os.getenv('POLLING_ENGINE') == 'async':
+        import async_polling
+        async_polling.main()
+    elif os.getenv('TENANTS_FILE') and int(os.getenv('WORKERS', 1)) > 1:
+        import supervisor
+        supervisor.main()
+    elif os.getenv('TENANTS_FILE'):
+        import tenants
+        tenants.main()
+    else:
+        main()
+    return 0
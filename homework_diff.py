@@ -0,0 +1,31 @@
+from typing import Dict, List, Tuple
+
+from homework_record import HomeworkRecord
+
+
+class HomeworkIndex:
+    """Индекс последних известных (статус, дата обновления) по работам."""
+
+    __slots__ = ('known',)
+
+    def __init__(self, known: Dict[str, Tuple[str, str]] = None) -> None:
+        """Начинаем с сохранённых статусов, если они есть."""
+        self.known = known if known is not None else {}
+
+    def diff(self,
+             homework_list: List[HomeworkRecord]) -> List[HomeworkRecord]:
+        """Работы из ответа, у которых изменился статус или дата."""
+        known = self.known
+        return [
+            homework for homework in homework_list
+            if known.get(homework.key) != (
+                homework.status, homework.date_updated
+            )
+        ]
+
+    def update(self, changes: List[HomeworkRecord]) -> None:
+        """Запоминание новых статусов после обработки изменений."""
+        for homework in changes:
+            self.known[homework.key] = (
+                homework.status, homework.date_updated
+            )
@@ -0,0 +1,61 @@
+import sys
+from collections import namedtuple
+from typing import List
+
+from exceptions import CheckResponseLogError
+
+
+HomeworkRecord = namedtuple(
+    'HomeworkRecord',
+    ('key', 'homework_name', 'status', 'date_updated', 'reviewer_comment')
+)
+HomeworkRecord.__doc__ = 'Работа из ответа API с заранее вычисленным ключом.'
+
+MISSING = object()
+
+
+def make_record(homework: dict) -> HomeworkRecord:
+    """Запись о работе из словаря API.
+
+    Ключ — id, а если его нет — название. Статус интернируется, так что
+    у тысяч записей одна и та же строка и сравнение идёт по ссылке.
+    """
+    if not isinstance(homework, dict):
+        raise TypeError('Дз получено не в виде словаря.')
+    get = homework.get
+    name = get('homework_name')
+    homework_id = get('id')
+    status = get('status')
+    return HomeworkRecord(
+        str(name if homework_id is None else homework_id),
+        name,
+        sys.intern(status) if isinstance(status, str) else status,
+        get('date_updated'),
+        get('reviewer_comment'),
+    )
+
+
+def parse_response(response: dict) -> List[HomeworkRecord]:
+    """Проверка ответа API и разбор работ в записи за один проход."""
+    if not isinstance(response, dict):
+        raise TypeError('API вернуло не словарь.')
+
+    homeworks = response.get('homeworks', MISSING)
+    if homeworks is MISSING:
+        raise KeyError(
+            'В ответе API не были получены списки домашних работ.'
+        )
+    if not isinstance(homeworks, list):
+        raise TypeError('Дз получено не в виде списка.')
+
+    current_date = response.get('current_date', MISSING)
+    if current_date is MISSING:
+        raise CheckResponseLogError(
+            'В ответе API не была получена дата.'
+        )
+    if not isinstance(current_date, int):
+        raise CheckResponseLogError(
+            'В ответе API была получена дата в неверном формате.'
+        )
+
+    return [make_record(homework) for homework in homeworks]
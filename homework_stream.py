@@ -0,0 +1,184 @@
+import re
+import json
+import codecs
+import calendar
+import time
+from typing import Callable, Iterable, Iterator, Optional
+
+from exceptions import CheckResponseLogError
+from homework_record import HomeworkRecord, make_record
+
+
+CHUNK_SIZE = 64 * 1024
+DATE_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+WHITESPACE = ' \t\n\r'
+# Ошибка в токене, который доходит до конца буфера, — признак обрыва.
+PARTIAL_TOKEN = re.compile(r'[^\s,:\]}"]*')
+
+decoder = json.JSONDecoder()
+
+
+class HomeworkStream:
+    """Потоковый разбор ответа API без загрузки всего JSON в память.
+
+    Работы из массива `homeworks` отдаются по одной по мере чтения
+    кусков ответа, каждая сразу проверяется `make_record`. Остальные
+    поля верхнего уровня (`current_date`) запоминаются как есть.
+    """
+
+    def __init__(self, chunks: Iterable[bytes],
+                 on_close: Callable[[], None] = None) -> None:
+        """Источник — куски тела ответа, например response.iter_content."""
+        self.chunks = iter(chunks)
+        self.on_close = on_close
+        self.utf8 = codecs.getincrementaldecoder('utf-8')()
+        self.buffer = ''
+        self.pos = 0
+        self.fields = {}
+
+    def close(self) -> None:
+        """Освобождение соединения, даже если ответ дочитан не до конца."""
+        if self.on_close is not None:
+            self.on_close()
+            self.on_close = None
+
+    def __enter__(self) -> 'HomeworkStream':
+        """Поток как контекстный менеджер."""
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Закрытие потока при выходе из блока with."""
+        self.close()
+
+    @property
+    def current_date(self) -> Optional[int]:
+        """Дата ответа, если она уже прочитана."""
+        return self.fields.get('current_date')
+
+    def __iter__(self) -> Iterator[HomeworkRecord]:
+        """Разбор объекта верхнего уровня с отдачей работ."""
+        if self.next_char() != '{':
+            raise TypeError('API вернуло не словарь.')
+        self.pos += 1
+        seen_homeworks = False
+        while self.next_char() != '}':
+            key = self.decode_value()
+            self.expect(':')
+            if key == 'homeworks':
+                seen_homeworks = True
+                yield from self.iter_array()
+            else:
+                self.fields[key] = self.decode_value()
+            if self.next_char() == ',':
+                self.pos += 1
+        self.check_fields(seen_homeworks)
+
+    def iter_array(self) -> Iterator[HomeworkRecord]:
+        """Работы из массива homeworks по одной."""
+        if self.next_char() != '[':
+            raise TypeError('Дз получено не в виде списка.')
+        self.pos += 1
+        while self.next_char() != ']':
+            yield make_record(self.decode_value())
+            if self.next_char() == ',':
+                self.pos += 1
+        self.pos += 1
+
+    def check_fields(self, seen_homeworks: bool) -> None:
+        """Проверка, как в check_response, после чтения всего ответа."""
+        if not seen_homeworks:
+            raise KeyError(
+                'В ответе API не были получены списки домашних работ.'
+            )
+        if 'current_date' not in self.fields:
+            raise CheckResponseLogError(
+                'В ответе API не была получена дата.'
+            )
+        if not isinstance(self.current_date, int):
+            raise CheckResponseLogError(
+                'В ответе API была получена дата в неверном формате.'
+            )
+
+    def fill(self) -> None:
+        """Чтение следующего куска; прочитанное начало буфера отбрасывается."""
+        chunk = next(self.chunks, None)
+        if chunk is None:
+            tail = self.utf8.decode(b'', final=True)
+            if not tail:
+                raise CheckResponseLogError(
+                    'Ответ API оборвался или не является JSON.'
+                )
+        else:
+            tail = self.utf8.decode(chunk)
+        self.buffer = self.buffer[self.pos:] + tail
+        self.pos = 0
+
+    def next_char(self) -> str:
+        """Первый непробельный символ без его потребления."""
+        while True:
+            while (self.pos < len(self.buffer)
+                   and self.buffer[self.pos] in WHITESPACE):
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            self.fill()
+
+    def expect(self, char: str) -> None:
+        """Потребление обязательного разделителя."""
+        if self.next_char() != char:
+            raise CheckResponseLogError('Ответ API не является JSON.')
+        self.pos += 1
+
+    def decode_value(self):
+        """Следующее значение JSON, при нехватке данных — дочитываем."""
+        self.next_char()
+        while True:
+            try:
+                value, end = decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError as error:
+                if not self.truncated(error):
+                    raise CheckResponseLogError(
+                        f'Ответ API не является JSON: {error}'
+                    )
+                self.fill()
+                continue
+            # Число в конце буфера может продолжаться в следующем куске.
+            if end == len(self.buffer) and not isinstance(
+                value, (dict, list, str)
+            ):
+                try:
+                    self.fill()
+                except CheckResponseLogError:
+                    pass
+                else:
+                    continue
+            self.pos = end
+            return value
+
+    def truncated(self, error: json.JSONDecodeError) -> bool:
+        """Значение оборвано концом буфера, а не испорчено."""
+        return (
+            error.msg.startswith('Unterminated string')
+            or PARTIAL_TOKEN.fullmatch(self.buffer, error.pos) is not None
+        )
+
+
+def updated_at(homework: HomeworkRecord) -> Optional[int]:
+    """Время обновления работы в секундах или None, если даты нет."""
+    if not homework.date_updated:
+        return None
+    return calendar.timegm(time.strptime(homework.date_updated, DATE_FORMAT))
+
+
+def until_watermark(records: Iterable[HomeworkRecord],
+                    watermark: int) -> Iterator[HomeworkRecord]:
+    """Работы новее watermark; API отдаёт их от новых к старым.
+
+    Как только встречается работа не новее сохранённой метки, чтение
+    прекращается — остальная история уже обработана раньше.
+    """
+    for homework in records:
+        updated = updated_at(homework)
+        if updated is not None and updated <= watermark:
+            return
+        yield homework
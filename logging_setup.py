@@ -0,0 +1,106 @@
+import os
+import gzip
+import json
+import queue
+import atexit
+import shutil
+import logging
+from logging.handlers import (
+    QueueHandler,
+    QueueListener,
+    RotatingFileHandler,
+    TimedRotatingFileHandler
+)
+
+
+TEXT_FORMAT = (
+    'line:%(lineno)s \n'
+    'time:%(asctime)s \n'
+    'status:%(levelname)s \n'
+    'info:%(message)s \n'
+)
+MAX_BYTES = 10 * 1024 * 1024
+BACKUP_COUNT = 5
+
+
+class JsonFormatter(logging.Formatter):
+    """Одна запись лога — одна строка JSON."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        """Сериализация записи в JSON."""
+        data = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'process': record.processName,
+            'line': record.lineno,
+            'message': record.getMessage(),
+        }
+        if record.exc_info:
+            data['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(data, ensure_ascii=False)
+
+
+def gzip_namer(name: str) -> str:
+    """Имя архива для ротированного файла."""
+    return f'{name}.gz'
+
+
+def gzip_rotator(source: str, dest: str) -> None:
+    """Сжатие ротированного файла в архив."""
+    with open(source, 'rb') as file_in, gzip.open(dest, 'wb') as file_out:
+        shutil.copyfileobj(file_in, file_out)
+    os.remove(source)
+
+
+def file_handler(path: str, when: str = None,
+                 max_bytes: int = MAX_BYTES,
+                 backup_count: int = BACKUP_COUNT) -> logging.Handler:
+    """Файловый обработчик с ротацией по времени или размеру."""
+    if when:
+        handler = TimedRotatingFileHandler(
+            path, when=when, backupCount=backup_count, encoding='utf-8'
+        )
+    else:
+        handler = RotatingFileHandler(
+            path, maxBytes=max_bytes, backupCount=backup_count,
+            encoding='utf-8'
+        )
+    handler.namer = gzip_namer
+    handler.rotator = gzip_rotator
+    return handler
+
+
+def stop_listener(listener: QueueListener) -> None:
+    """Дописывание очереди в файл при выходе, повторный вызов безопасен."""
+    if listener._thread is not None:
+        listener.stop()
+
+
+def configure_logging(path: str, level: int = logging.INFO,
+                      as_json: bool = False, when: str = None,
+                      max_bytes: int = MAX_BYTES,
+                      backup_count: int = BACKUP_COUNT,
+                      log_queue=None) -> QueueListener:
+    """Неблокирующее логирование: запись в файл идёт в отдельном потоке.
+
+    Корневой логгер только кладёт записи в очередь, а QueueListener
+    пишет их в файл с ротацией и сжатием архивов. Для нескольких
+    процессов можно передать `multiprocessing.Queue`.
+    """
+    handler = file_handler(path, when, max_bytes, backup_count)
+    handler.setFormatter(
+        JsonFormatter() if as_json else logging.Formatter(TEXT_FORMAT)
+    )
+    log_queue = log_queue if log_queue is not None else queue.Queue(-1)
+    listener = QueueListener(log_queue, handler, respect_handler_level=True)
+
+    root = logging.getLogger()
+    for old_handler in root.handlers[:]:
+        root.removeHandler(old_handler)
+    root.addHandler(QueueHandler(log_queue))
+    root.setLevel(level)
+
+    listener.start()
+    atexit.register(stop_listener, listener)
+    return listener
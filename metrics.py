@@ -0,0 +1,193 @@
+import time
+import bisect
+import logging
+import threading
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Dict, Iterator, List, Sequence, Union
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+
+DEFAULT_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10
+)
+WAIT_BUCKETS = (0, 0.1, 0.5, 1, 2.5, 5, 10, 30, 60)
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class Counter:
+    """Монотонно растущий счётчик."""
+
+    kind = 'counter'
+
+    def __init__(self, name: str, documentation: str) -> None:
+        """Счётчик начинается с нуля."""
+        self.name = name
+        self.documentation = documentation
+        self.value = 0.0
+        self.lock = threading.Lock()
+
+    def inc(self, amount: float = 1) -> None:
+        """Увеличение счётчика."""
+        with self.lock:
+            self.value += amount
+
+    def samples(self) -> List[str]:
+        """Строки значения в текстовом формате Prometheus."""
+        return [f'{self.name} {self.value:g}']
+
+
+class Histogram:
+    """Гистограмма длительностей с фиксированными границами корзин."""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str,
+                 buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        """Последняя корзина +Inf добавляется автоматически."""
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        """Учёт одного замера."""
+        index = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def samples(self) -> List[str]:
+        """Строки корзин, суммы и количества в формате Prometheus."""
+        with self.lock:
+            counts, total, count = self.counts[:], self.sum, self.count
+        lines = []
+        cumulative = 0
+        bounds = [f'{bound:g}' for bound in self.buckets] + ['+Inf']
+        for bound, bucket in zip(bounds, counts):
+            cumulative += bucket
+            lines.append(f'{self.name}_bucket{{le="{bound}"}} {cumulative}')
+        lines.append(f'{self.name}_sum {total:g}')
+        lines.append(f'{self.name}_count {count}')
+        return lines
+
+
+class Registry:
+    """Набор метрик процесса."""
+
+    def __init__(self) -> None:
+        """Метрики хранятся в порядке регистрации."""
+        self.metrics: Dict[str, Union[Counter, Histogram]] = {}
+
+    def counter(self, name: str, documentation: str) -> Counter:
+        """Регистрация счётчика."""
+        return self.metrics.setdefault(name, Counter(name, documentation))
+
+    def histogram(self, name: str, documentation: str,
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        """Регистрация гистограммы."""
+        return self.metrics.setdefault(
+            name, Histogram(name, documentation, buckets)
+        )
+
+    def render(self) -> str:
+        """Все метрики в текстовом формате Prometheus."""
+        lines = []
+        for metric in self.metrics.values():
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            lines.extend(metric.samples())
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+API_REQUEST = registry.histogram(
+    'homework_api_request_seconds', 'Длительность запроса к API Практикума.'
+)
+API_ERRORS = registry.counter(
+    'homework_api_errors_total', 'Неудачные запросы к API Практикума.'
+)
+POLLS_SKIPPED = registry.counter(
+    'homework_polls_skipped_total',
+    'Опросы, обработка которых пропущена: ответ API не изменился.'
+)
+VALIDATE = registry.histogram(
+    'homework_validate_seconds', 'Длительность проверки ответа API.'
+)
+VALIDATE_ERRORS = registry.counter(
+    'homework_validate_errors_total', 'Ответы API, не прошедшие проверку.'
+)
+RENDER = registry.histogram(
+    'homework_render_seconds', 'Длительность сборки текста уведомления.'
+)
+RENDER_ERRORS = registry.counter(
+    'homework_render_errors_total', 'Ошибки сборки текста уведомления.'
+)
+SEND = registry.histogram(
+    'homework_telegram_send_seconds', 'Длительность отправки в телеграм.'
+)
+SEND_ERRORS = registry.counter(
+    'homework_telegram_send_errors_total', 'Неудачные отправки в телеграм.'
+)
+SEND_WAIT = registry.histogram(
+    'homework_telegram_send_wait_seconds',
+    'Ожидание лимита перед отправкой в телеграм.', WAIT_BUCKETS
+)
+SEND_DROPPED = registry.counter(
+    'homework_telegram_send_dropped_total',
+    'Сообщения, отброшенные из-за слишком долгого ожидания лимита.'
+)
+
+
+@contextmanager
+def track(histogram: Histogram, errors: Counter = None) -> Iterator[None]:
+    """Замер длительности блока и учёт исключений в нём."""
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        if errors is not None:
+            errors.inc()
+        raise
+    finally:
+        histogram.observe(time.perf_counter() - started)
+
+
+def serve(port: int, host: str = '127.0.0.1') -> 'ThreadingHTTPServer':
+    """Запуск HTTP-сервера метрик в фоновом потоке."""
+    # http.server тянет за собой email и mimetypes, поэтому импортируется
+    # только при включённых метриках.
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        """Отдача метрик по GET /metrics."""
+
+        def do_GET(self) -> None:
+            """Ответ текстом Prometheus или 404 для других путей."""
+            if self.path.split('?', 1)[0] != '/metrics':
+                self.send_error(404)
+                return
+            body = registry.render().encode()
+            self.send_response(200)
+            self.send_header('Content-Type', CONTENT_TYPE)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args) -> None:
+            """Запросы сборщика метрик не засоряют основной лог."""
+            logging.debug(format % args)
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    thread = threading.Thread(
+        target=server.serve_forever, name='metrics', daemon=True
+    )
+    thread.start()
+    logging.info(f'Метрики доступны на http://{host}:{port}/metrics.')
+    return server
@@ -0,0 +1,102 @@
+import time
+import zlib
+import queue
+import logging
+import threading
+from typing import List
+
+from telegram import Bot
+from telegram.error import BadRequest, NetworkError, RetryAfter, TelegramError
+
+from exceptions import SendMessageError
+
+
+DEFAULT_WORKERS = 4
+DEFAULT_MAXSIZE = 1000
+MAX_RETRIES = 5
+RETRY_BASE = 1
+RETRY_MAX = 60
+
+
+class Outbox:
+    """Ограниченная очередь исходящих сообщений с пулом отправщиков.
+
+    Сообщения одного чата всегда попадают к одному и тому же
+    отправщику, поэтому порядок внутри чата сохраняется. Поддерживает
+    интерфейс `send_message` бота, так что её можно передавать
+    вместо `Bot`.
+    """
+
+    def __init__(self, bot: Bot, workers: int = DEFAULT_WORKERS,
+                 maxsize: int = DEFAULT_MAXSIZE,
+                 max_retries: int = MAX_RETRIES) -> None:
+        """Создаём очереди и запускаем отправщиков."""
+        self.bot = bot
+        self.max_retries = max_retries
+        self.queues: List[queue.Queue] = [
+            queue.Queue(maxsize) for _ in range(workers)
+        ]
+        self.threads = [
+            threading.Thread(
+                target=self._work, args=(chat_queue,),
+                name=f'outbox-{number}', daemon=True
+            )
+            for number, chat_queue in enumerate(self.queues)
+        ]
+        for thread in self.threads:
+            thread.start()
+
+    def send_message(self, chat_id: str, text: str, **kwargs) -> None:
+        """Постановка сообщения в очередь отправщика этого чата."""
+        shard = zlib.crc32(str(chat_id).encode()) % len(self.queues)
+        try:
+            self.queues[shard].put_nowait((chat_id, text, kwargs))
+        except queue.Full:
+            raise SendMessageError('Очередь исходящих сообщений переполнена.')
+
+    def close(self, timeout: float = None) -> None:
+        """Отправка оставшихся сообщений и остановка отправщиков."""
+        for chat_queue in self.queues:
+            chat_queue.put(None)
+        for thread in self.threads:
+            thread.join(timeout)
+
+    def _work(self, chat_queue: queue.Queue) -> None:
+        while True:
+            item = chat_queue.get()
+            if item is None:
+                return
+            try:
+                self._deliver(*item)
+            except Exception:
+                # Поток отправщика не должен умирать: иначе очередь
+                # его чатов переполнится до перезапуска процесса.
+                logging.exception(f'Сбой отправки в чат {item[0]}.')
+
+    def _deliver(self, chat_id: str, text: str, kwargs: dict) -> None:
+        delay = RETRY_BASE
+        for _ in range(self.max_retries):
+            try:
+                self.bot.send_message(chat_id, text=text, **kwargs)
+            except SendMessageError as error:
+                logging.error(error)
+                return
+            except RetryAfter as error:
+                logging.warning(
+                    f'Телеграм просит подождать {error.retry_after} с.'
+                )
+                time.sleep(error.retry_after)
+            except BadRequest as error:
+                logging.error(f'Сообщение в чат {chat_id} отброшено: {error}')
+                return
+            except NetworkError as error:
+                logging.warning(f'Повтор отправки через {delay} с: {error}')
+                time.sleep(delay)
+                delay = min(delay * 2, RETRY_MAX)
+            except TelegramError as error:
+                logging.error(f'Сообщение в чат {chat_id} отброшено: {error}')
+                return
+            else:
+                logging.info('Сообщение отправлено.')
+                return
+        logging.error(f'Не удалось отправить сообщение в чат {chat_id}.')
@@ -0,0 +1,176 @@
+import time
+import logging
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Iterator, Optional, Tuple
+
+from circuit_breaker import CircuitBreaker
+from exceptions import APIError
+from homework_stream import CHUNK_SIZE, HomeworkStream
+from response_cache import ResponseCache
+
+
+if TYPE_CHECKING:
+    import requests
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_TIMEOUT = (3.05, 10)
+
+
+class PracticumClient:
+    """Клиент API Практикума с пулом keep-alive соединений.
+
+    Пока пул не открыт методом `open`, каждый запрос идёт через
+    одноразовый `requests.get`. Сам `requests` импортируется при первом
+    запросе, чтобы не замедлять запуск. Сбои на стороне сервиса (5xx и ошибки
+    соединения) учитываются предохранителем `breaker`, а повторы прежнего
+    ответа распознаются кэшем отпечатков `cache`.
+    """
+
+    def __init__(self, endpoint: str,
+                 pool_size: int = DEFAULT_POOL_SIZE,
+                 timeout: Tuple[float, float] = DEFAULT_TIMEOUT,
+                 breaker: CircuitBreaker = None,
+                 cache: ResponseCache = None) -> None:
+        """Сохраняем адрес API, размер пула, таймауты и предохранитель."""
+        self.endpoint = endpoint
+        self.breaker = breaker
+        self.cache = cache
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.session: Optional['requests.Session'] = None
+        self.last_elapsed = 0.0
+        self.total_elapsed = 0.0
+        self.request_count = 0
+
+    def open(self) -> None:
+        """Создание сессии с пулом соединений."""
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        if self.session is not None:
+            return
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_size, pool_maxsize=self.pool_size
+        )
+        self.session = requests.Session()
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def close(self) -> None:
+        """Закрытие сессии и всех соединений пула."""
+        if self.session is not None:
+            self.session.close()
+            self.session = None
+
+    @property
+    def average_elapsed(self) -> float:
+        """Среднее время запроса в секундах."""
+        if not self.request_count:
+            return 0.0
+        return self.total_elapsed / self.request_count
+
+    def get_homeworks(self, token: str, from_date: int) -> dict:
+        """Запрос статусов домашних работ начиная с from_date."""
+        import requests
+
+        headers = {'Authorization': f'OAuth {token}'}
+        etag = self.cache.etag(token) if self.cache is not None else None
+        if etag:
+            headers['If-None-Match'] = etag
+        params = {'from_date': from_date}
+        transport = self.session if self.session is not None else requests
+        if self.breaker is not None:
+            self.breaker.before_call()
+
+        started = time.perf_counter()
+        try:
+            response = self._request(transport, headers, params)
+            if etag and response.status_code == HTTPStatus.NOT_MODIFIED:
+                return self.cache.not_modified(from_date)
+            if response.status_code != HTTPStatus.OK:
+                raise APIError(
+                    f'Сервер сервиса не дал ответа. {response.status_code}.'
+                )
+            return self._decode(token, response)
+        except requests.RequestException as error:
+            raise APIError(
+                error,
+                'Ошибка при получении ответа от API.'
+            )
+        finally:
+            self.last_elapsed = time.perf_counter() - started
+            self.total_elapsed += self.last_elapsed
+            self.request_count += 1
+            logging.debug(f'Запрос к API занял {self.last_elapsed:.3f} с.')
+
+    def _decode(self, token: str, response: 'requests.Response') -> dict:
+        body = getattr(response, 'content', None)
+        if self.cache is None or not isinstance(body, bytes):
+            return response.json()
+        digest, unchanged = self.cache.lookup(token, body)
+        if unchanged is not None:
+            return unchanged
+        data = response.json()
+        self.cache.store(token, digest, response.headers.get('ETag'), data)
+        return data
+
+    def stream_homeworks(self, token: str,
+                         from_date: int = 0) -> HomeworkStream:
+        """Потоковое чтение работ, например всей истории с from_date=0.
+
+        Тело ответа читается кусками по мере перебора работ; поток надо
+        закрыть (или использовать в with), если перебор прерван раньше.
+        """
+        import requests
+
+        headers = {'Authorization': f'OAuth {token}'}
+        params = {'from_date': from_date}
+        transport = self.session if self.session is not None else requests
+        if self.breaker is not None:
+            self.breaker.before_call()
+        try:
+            response = self._request(transport, headers, params, stream=True)
+        except requests.RequestException as error:
+            raise APIError(
+                error,
+                'Ошибка при получении ответа от API.'
+            )
+        if response.status_code != HTTPStatus.OK:
+            response.close()
+            raise APIError(
+                f'Сервер сервиса не дал ответа. {response.status_code}.'
+            )
+        return HomeworkStream(self._iter_chunks(response), response.close)
+
+    def _iter_chunks(self, response: 'requests.Response') -> Iterator[bytes]:
+        import requests
+
+        try:
+            yield from response.iter_content(CHUNK_SIZE)
+        except requests.RequestException as error:
+            raise APIError(error, 'Ответ API оборвался.')
+
+    def _request(self, transport, headers: dict, params: dict,
+                 stream: bool = False) -> 'requests.Response':
+        import requests
+
+        try:
+            response = transport.get(
+                self.endpoint, headers=headers, params=params,
+                timeout=self.timeout, stream=stream
+            )
+        except requests.RequestException:
+            self._record(failed=True)
+            raise
+        self._record(
+            failed=response.status_code >= HTTPStatus.INTERNAL_SERVER_ERROR
+        )
+        return response
+
+    def _record(self, failed: bool) -> None:
+        if self.breaker is None:
+            return
+        if failed:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
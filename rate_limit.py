@@ -0,0 +1,90 @@
+import time
+import threading
+from typing import Dict
+
+import metrics
+from exceptions import SendMessageError
+
+
+GLOBAL_RATE = 30
+CHAT_RATE = 1
+MAX_WAIT = 60
+
+
+class TokenBucket:
+    """Классический token bucket: rate токенов в секунду, запас burst."""
+
+    __slots__ = ('rate', 'capacity', 'tokens', 'updated')
+
+    def __init__(self, rate: float, burst: float = None) -> None:
+        """Ведро изначально заполнено."""
+        self.rate = rate
+        self.capacity = burst if burst is not None else rate
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def reserve(self, now: float) -> float:
+        """Забираем токен и возвращаем, сколько нужно подождать."""
+        elapsed = max(now - self.updated, 0.0)
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.updated = max(now, self.updated)
+        self.tokens -= 1
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens / self.rate
+
+
+class RateLimiter:
+    """Ограничение отправки: общее ведро бота и ведро на каждый чат.
+
+    Реализует `send_message` как у `Bot`, поэтому оборачивает бота
+    прозрачно. Если ожидание превышает `max_wait`, сообщение
+    отбрасывается с `SendMessageError` и учитывается в `dropped`.
+    Ожидание и отброшенные сообщения попадают в метрики.
+    """
+
+    def __init__(self, bot=None, global_rate: float = GLOBAL_RATE,
+                 chat_rate: float = CHAT_RATE,
+                 max_wait: float = MAX_WAIT) -> None:
+        """Создаём общее ведро; ведра чатов появляются по мере надобности."""
+        self.bot = bot
+        self.chat_rate = chat_rate
+        self.max_wait = max_wait
+        self.global_bucket = TokenBucket(global_rate)
+        self.chat_buckets: Dict[str, TokenBucket] = {}
+        self.lock = threading.Lock()
+        self.sent = 0
+        self.dropped = 0
+
+    def acquire(self, chat_id: str) -> float:
+        """Резервирование места под сообщение, возвращает ожидание."""
+        with self.lock:
+            now = time.monotonic()
+            bucket = self.chat_buckets.get(chat_id)
+            if bucket is None:
+                bucket = self.chat_buckets[chat_id] = TokenBucket(
+                    self.chat_rate
+                )
+            wait = max(bucket.reserve(now), self.global_bucket.reserve(now))
+            if wait > self.max_wait:
+                # Возвращаем токены: сообщение всё равно не уйдёт.
+                bucket.tokens += 1
+                self.global_bucket.tokens += 1
+                self.dropped += 1
+                metrics.SEND_DROPPED.inc()
+                return -1.0
+            self.sent += 1
+        metrics.SEND_WAIT.observe(wait)
+        return wait
+
+    def send_message(self, chat_id: str, text: str, **kwargs):
+        """Отправка сообщения с соблюдением лимитов."""
+        wait = self.acquire(str(chat_id))
+        if wait < 0:
+            raise SendMessageError(
+                f'Сообщение в чат {chat_id} отброшено по лимиту.'
+            )
+        if wait:
+            time.sleep(wait)
+        with metrics.track(metrics.SEND, metrics.SEND_ERRORS):
+            return self.bot.send_message(chat_id, text=text, **kwargs)
@@ -0,0 +1,159 @@
+import re
+import html
+from collections import namedtuple
+from string import Formatter
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from homework_record import HomeworkRecord
+
+
+EMOJI = {
+    'approved': '\U0001F4C8',
+    'reviewing': '\U0001F50D',
+    'rejected': '\U0001F6A8',
+}
+
+Locale = namedtuple('Locale', ('verdicts', 'headline', 'message'))
+Locale.__doc__ = 'Тексты вердиктов и шаблоны уведомления на одном языке.'
+
+LOCALES = {
+    'ru': Locale(
+        verdicts={
+            'approved': 'Работа проверена: ревьюеру всё понравилось. Ура!',
+            'reviewing': 'Работа взята на проверку ревьюером.',
+            'rejected': 'Работа проверена: у ревьюера есть замечания.',
+        },
+        headline='Изменился статус проверки работы "{name}". {verdict}',
+        message=(
+            '{headline} {emoji} \n'
+            'Статус: {status} \U0001F6A9 \n'
+            'Комментарий:{comment} \U0001F4DC'
+        ),
+    ),
+    'en': Locale(
+        verdicts={
+            'approved': 'The reviewer approved the homework. Hooray!',
+            'reviewing': 'The homework is being reviewed.',
+            'rejected': 'The reviewer has some remarks on the homework.',
+        },
+        headline='Review status of "{name}" has changed. {verdict}',
+        message=(
+            '{headline} {emoji} \n'
+            'Status: {status} \U0001F6A9 \n'
+            'Comment:{comment} \U0001F4DC'
+        ),
+    ),
+}
+
+MARKDOWN_SPECIAL = re.compile(r'([_*\[\]()~`>#+\-=|{}.!\\])')
+LEGACY_MARKDOWN_SPECIAL = re.compile(r'([_*`\[])')
+
+
+def escape_markdown(text: str) -> str:
+    """Экранирование для parse_mode MarkdownV2."""
+    return MARKDOWN_SPECIAL.sub(r'\\\1', text)
+
+
+def escape_legacy_markdown(text: str) -> str:
+    """Экранирование для устаревшего parse_mode Markdown."""
+    return LEGACY_MARKDOWN_SPECIAL.sub(r'\\\1', text)
+
+
+def escape_html(text: str) -> str:
+    """Экранирование для parse_mode HTML."""
+    return html.escape(text, quote=False)
+
+
+ESCAPES: Dict[Optional[str], Callable[[str], str]] = {
+    None: str,
+    'HTML': escape_html,
+    'MarkdownV2': escape_markdown,
+    'Markdown': escape_legacy_markdown,
+}
+
+
+def settings_error(locale: str, parse_mode: Optional[str]) -> Optional[str]:
+    """Описание ошибки в языке или режиме разметки, если она есть."""
+    if locale not in LOCALES:
+        return (
+            f'Неизвестный язык уведомлений {locale}, '
+            f'доступны: {", ".join(LOCALES)}.'
+        )
+    if parse_mode not in ESCAPES:
+        modes = ', '.join(mode for mode in ESCAPES if mode)
+        return (
+            f'Неизвестный режим разметки {parse_mode}, доступны: {modes}.'
+        )
+    return None
+
+
+Template = Tuple[Tuple[str, Optional[str]], ...]
+
+
+def compile_template(text: str, escape: Callable[[str], str]) -> Template:
+    """Шаблон в виде пар (экранированный текст, имя поля).
+
+    Постоянные части экранируются один раз при компиляции, при
+    отрисовке экранируются только подставляемые значения.
+    """
+    return tuple(
+        (escape(literal), field)
+        for literal, field, _, _ in Formatter().parse(text)
+    )
+
+
+class Renderer:
+    """Отрисовка уведомлений по заранее собранным шаблонам статусов.
+
+    Для каждого статуса вердикт, смайлик и сам статус подставляются
+    в шаблон при создании, так что при отрисовке остаются только
+    название работы и комментарий ревьюера.
+    """
+
+    __slots__ = ('locale', 'parse_mode', 'escape', 'verdicts',
+                 'headlines', 'messages')
+
+    def __init__(self, locale: str = 'ru', parse_mode: str = None) -> None:
+        """Сборка шаблонов для языка locale и режима разметки parse_mode."""
+        texts = LOCALES[locale]
+        self.locale = locale
+        self.parse_mode = parse_mode
+        self.escape = ESCAPES[parse_mode]
+        self.verdicts = texts.verdicts
+        self.headlines: Dict[str, Template] = {}
+        self.messages: Dict[str, Template] = {}
+        for status, verdict in texts.verdicts.items():
+            headline = texts.headline.format(name='{name}', verdict=verdict)
+            message = texts.message.format(
+                headline=headline, emoji=EMOJI[status], status=status,
+                comment='{comment}'
+            )
+            self.headlines[status] = compile_template(headline, self.escape)
+            self.messages[status] = compile_template(message, self.escape)
+
+    def fill(self, template: Template, homework: HomeworkRecord) -> str:
+        """Подстановка названия работы и комментария в шаблон."""
+        escape = self.escape
+        values = {
+            'name': homework.homework_name,
+            'comment': homework.reviewer_comment or '',
+        }
+        parts = []
+        for literal, field in template:
+            parts.append(literal)
+            if field is not None:
+                parts.append(escape(str(values[field])))
+        return ''.join(parts)
+
+    def headline(self, homework: HomeworkRecord) -> str:
+        """Строка об изменении статуса с вердиктом."""
+        return self.fill(self.headlines[homework.status], homework)
+
+    def render(self, homework: HomeworkRecord) -> str:
+        """Полный текст уведомления."""
+        return self.fill(self.messages[homework.status], homework)
+
+    def render_batch(self, changes: Iterable[HomeworkRecord]) -> List[str]:
+        """Уведомления по пачке изменений."""
+        render = self.render
+        return [render(homework) for homework in changes]
@@ -0,0 +1,96 @@
+import re
+import hashlib
+import threading
+from typing import Dict, Optional, Tuple
+
+import metrics
+
+
+CURRENT_DATE = re.compile(rb'"current_date"\s*:\s*(-?\d+)')
+
+
+class UnchangedResponse(dict):
+    """Ответ API, совпавший с предыдущим: новых работ в нём нет.
+
+    Это обычный корректный ответ без работ, так что код, не знающий
+    о кэше, обработает его как ответ без изменений.
+    """
+
+    def __init__(self, current_date: int) -> None:
+        """Пустой список работ и дата ответа."""
+        super().__init__(homeworks=[], current_date=current_date)
+
+
+def fingerprint(body: bytes) -> Tuple[bytes, Optional[int]]:
+    """Хеш тела ответа без current_date и сама current_date.
+
+    Дата меняется в каждом ответе, поэтому в хеш не входит.
+    """
+    match = CURRENT_DATE.search(body)
+    if match is None:
+        return hashlib.blake2b(body, digest_size=16).digest(), None
+    stripped = body[:match.start()] + body[match.end():]
+    return (
+        hashlib.blake2b(stripped, digest_size=16).digest(),
+        int(match.group(1))
+    )
+
+
+def is_well_formed(data: dict) -> bool:
+    """Ответ, который можно пропускать при повторе, должен быть корректным."""
+    if not isinstance(data, dict):
+        return False
+    homeworks = data.get('homeworks')
+    return (
+        isinstance(homeworks, list)
+        and isinstance(data.get('current_date'), int)
+        and all(isinstance(homework, dict) for homework in homeworks)
+    )
+
+
+class ResponseCache:
+    """Отпечатки последних ответов API по токенам.
+
+    Если тело ответа (без current_date) совпадает с предыдущим
+    корректным ответом или сервер ответил 304 на If-None-Match,
+    разбор, проверка и сборка сообщений пропускаются.
+    """
+
+    def __init__(self) -> None:
+        """Кэш изначально пуст."""
+        self.entries: Dict[str, Tuple[bytes, Optional[str]]] = {}
+        self.skipped = 0
+        self.lock = threading.Lock()
+
+    def etag(self, token: str) -> Optional[str]:
+        """Последний ETag ответа для заголовка If-None-Match."""
+        entry = self.entries.get(token)
+        return entry[1] if entry else None
+
+    def lookup(self, token: str,
+               body: bytes) -> Tuple[bytes, Optional[UnchangedResponse]]:
+        """Отпечаток тела и готовый ответ, если тело не изменилось."""
+        digest, current_date = fingerprint(body)
+        entry = self.entries.get(token)
+        if current_date is None or entry is None or entry[0] != digest:
+            return digest, None
+        return digest, self.skip(current_date)
+
+    def not_modified(self, from_date: int) -> UnchangedResponse:
+        """Ответ для 304: дата опроса не сдвигается."""
+        return self.skip(from_date)
+
+    def store(self, token: str, digest: bytes, etag: Optional[str],
+              data: dict) -> None:
+        """Запоминание отпечатка, только если ответ корректен."""
+        if is_well_formed(data):
+            self.entries[token] = (digest, etag)
+        else:
+            self.entries.pop(token, None)
+
+    def skip(self, current_date: int) -> UnchangedResponse:
+        """Учёт пропущенного цикла обработки."""
+        with self.lock:
+            self.skipped += 1
+        metrics.POLLS_SKIPPED.inc()
+        return UnchangedResponse(current_date)
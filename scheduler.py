@@ -0,0 +1,74 @@
+import os
+import time
+import random
+from collections import namedtuple
+from typing import Iterable
+
+
+IntervalPolicy = namedtuple(
+    'IntervalPolicy',
+    (
+        'base', 'min_interval', 'max_interval',
+        'reviewing_interval', 'idle_interval', 'idle_after'
+    ),
+    defaults=(600, 60, 3600, 120, 1800, 3 * 24 * 60 * 60)
+)
+
+
+MAX_BACKOFF_EXPONENT = 16
+
+
+def policy_from_env(base: int = 600) -> IntervalPolicy:
+    """Политика интервалов с границами из переменных окружения."""
+    return IntervalPolicy(
+        base=base,
+        min_interval=int(os.getenv('POLL_MIN_INTERVAL', 60)),
+        max_interval=int(os.getenv('POLL_MAX_INTERVAL', 3600)),
+    )
+
+
+class PollSchedule:
+    """Адаптивный интервал опроса для одного получателя.
+
+    Пока работа на проверке, опрашиваем чаще; при ошибках API
+    отступаем экспоненциально со случайным разбросом; если ничего
+    не менялось несколько дней, опрашиваем реже.
+    """
+
+    __slots__ = ('policy', 'failures', 'last_change', 'reviewing')
+
+    def __init__(self, policy: IntervalPolicy = IntervalPolicy()) -> None:
+        """Начинаем с базового интервала."""
+        self.policy = policy
+        self.failures = 0
+        self.last_change = time.time()
+        self.reviewing = False
+
+    def record_success(self, statuses: Iterable[str],
+                       now: float = None) -> None:
+        """Учёт успешного опроса и статусов, пришедших в ответе."""
+        self.failures = 0
+        statuses = list(statuses)
+        if statuses:
+            self.last_change = time.time() if now is None else now
+            self.reviewing = 'reviewing' in statuses
+
+    def record_failure(self) -> None:
+        """Учёт неудачного обращения к API."""
+        self.failures += 1
+
+    def next_delay(self, now: float = None) -> float:
+        """Задержка в секундах до следующего опроса."""
+        policy = self.policy
+        now = time.time() if now is None else now
+        if self.failures:
+            exponent = min(self.failures, MAX_BACKOFF_EXPONENT)
+            ceiling = policy.base * 2 ** exponent
+            delay = random.uniform(ceiling / 2, ceiling)
+        elif self.reviewing:
+            delay = policy.reviewing_interval
+        elif now - self.last_change > policy.idle_after:
+            delay = policy.idle_interval
+        else:
+            delay = policy.base
+        return min(max(delay, policy.min_interval), policy.max_interval)
@@ -0,0 +1,33 @@
+import time
+from typing import Dict
+
+
+class StartupReport:
+    """Замер этапов запуска: импорт, конфигурация, первый опрос."""
+
+    def __init__(self) -> None:
+        """Отсчёт ведётся с момента первого импорта модуля."""
+        self.started = time.perf_counter()
+        self.last = self.started
+        self.phases: Dict[str, float] = {}
+
+    def mark(self, phase: str) -> bool:
+        """Завершение этапа; повторная отметка этапа игнорируется."""
+        if phase in self.phases:
+            return False
+        now = time.perf_counter()
+        self.phases[phase] = now - self.last
+        self.last = now
+        return True
+
+    def summary(self) -> str:
+        """Текстовый отчёт о времени запуска."""
+        parts = [
+            f'{phase}: {seconds * 1000:.0f} мс'
+            for phase, seconds in self.phases.items()
+        ]
+        total = (self.last - self.started) * 1000
+        return f'Запуск за {total:.0f} мс ({", ".join(parts)}).'
+
+
+report = StartupReport()
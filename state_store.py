@@ -0,0 +1,139 @@
+import json
+import hashlib
+import sqlite3
+import threading
+from typing import Dict, Iterable, Optional, Tuple
+
+from homework_record import HomeworkRecord
+
+
+# Несколько процессов пишут в одну базу, ждём блокировку подольше.
+LOCK_TIMEOUT = 30
+
+SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS watermarks ('
+    ' tenant TEXT PRIMARY KEY, watermark INTEGER NOT NULL)',
+    'CREATE TABLE IF NOT EXISTS homeworks ('
+    ' tenant TEXT NOT NULL, homework_id TEXT NOT NULL,'
+    ' status TEXT, date_updated TEXT,'
+    ' PRIMARY KEY (tenant, homework_id))',
+    'CREATE TABLE IF NOT EXISTS boards ('
+    ' chat_id TEXT PRIMARY KEY, message_id INTEGER NOT NULL, entries TEXT)',
+)
+
+
+def state_key(token: str) -> str:
+    """Ключ состояния получателя, не раскрывающий сам токен."""
+    return hashlib.sha256(str(token).encode()).hexdigest()[:32]
+
+
+class StateStore:
+    """Долговременное хранилище метки времени и статусов работ в SQLite.
+
+    Изменения копятся в памяти и записываются одной транзакцией
+    при вызове `flush`, база работает в режиме WAL.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Открываем базу и создаём таблицы при первом запуске."""
+        self.connection = sqlite3.connect(path, timeout=LOCK_TIMEOUT)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        with self.connection:
+            for statement in SCHEMA:
+                self.connection.execute(statement)
+        self._watermarks: Dict[str, int] = {}
+        self._homeworks: Dict[Tuple[str, str], Tuple[str, str]] = {}
+        self._boards: Dict[str, Tuple[int, str]] = {}
+        # Табло может сохраняться из потока отложенной правки.
+        self.lock = threading.Lock()
+
+    def load(self, key: str) -> Optional[int]:
+        """Последняя метка времени получателя."""
+        row = self.connection.execute(
+            'SELECT watermark FROM watermarks WHERE tenant = ?', (key,)
+        ).fetchone()
+        return row[0] if row is not None else None
+
+    def load_homeworks(self, key: str) -> Dict[str, Tuple[str, str]]:
+        """Последние известные статусы работ получателя."""
+        rows = self.connection.execute(
+            'SELECT homework_id, status, date_updated FROM homeworks '
+            'WHERE tenant = ?',
+            (key,)
+        )
+        return {
+            homework_id: (status, date_updated)
+            for homework_id, status, date_updated in rows
+        }
+
+    def load_board(self, chat_id: str) -> Optional[Tuple[int, dict]]:
+        """Id закреплённого табло чата и его строки."""
+        row = self.connection.execute(
+            'SELECT message_id, entries FROM boards WHERE chat_id = ?',
+            (chat_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1] or '{}')
+
+    def stage(self, key: str, current_date: int) -> None:
+        """Запоминание метки времени до следующего flush."""
+        self._watermarks[key] = current_date
+
+    def stage_homeworks(self, key: str,
+                        homeworks: Iterable[HomeworkRecord]) -> None:
+        """Запоминание статусов работ из ответа API до flush."""
+        for homework in homeworks:
+            self._homeworks[key, homework.key] = (
+                homework.status, homework.date_updated
+            )
+
+    def stage_board(self, chat_id: str, message_id: int,
+                    entries: dict) -> None:
+        """Запоминание табло чата до следующего flush."""
+        with self.lock:
+            self._boards[chat_id] = (
+                message_id, json.dumps(entries, ensure_ascii=False)
+            )
+
+    def flush(self) -> None:
+        """Запись накопленных изменений одной транзакцией."""
+        with self.lock:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not (self._watermarks or self._homeworks or self._boards):
+            return
+        with self.connection:
+            self.connection.executemany(
+                'INSERT OR REPLACE INTO watermarks (tenant, watermark) '
+                'VALUES (?, ?)',
+                self._watermarks.items()
+            )
+            self.connection.executemany(
+                'INSERT OR REPLACE INTO homeworks '
+                '(tenant, homework_id, status, date_updated) '
+                'VALUES (?, ?, ?, ?)',
+                (
+                    (key, homework_id, status, date_updated)
+                    for (key, homework_id), (status, date_updated)
+                    in self._homeworks.items()
+                )
+            )
+            self.connection.executemany(
+                'INSERT OR REPLACE INTO boards (chat_id, message_id, entries) '
+                'VALUES (?, ?, ?)',
+                (
+                    (chat_id, message_id, entries)
+                    for chat_id, (message_id, entries) in self._boards.items()
+                )
+            )
+        self._watermarks.clear()
+        self._homeworks.clear()
+        self._boards.clear()
+
+    def close(self) -> None:
+        """Запись остатка изменений и закрытие базы."""
+        self.flush()
+        self.connection.close()
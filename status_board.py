@@ -0,0 +1,178 @@
+import logging
+import threading
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from exceptions import LogError, SendMessageError
+from homework import HOMEWORK_STATES, emoji
+from homework_record import HomeworkRecord
+from rate_limit import RateLimiter
+from state_store import StateStore
+
+if TYPE_CHECKING:
+    from telegram import Bot
+
+
+VERDICTS = ('approved', 'rejected')
+BOARD_TITLE = 'Статусы домашних работ \U0001F4CB'
+UNKNOWN_STATUS = '\u2753'
+
+
+class ChatBoard:
+    """Табло одного чата: id закреплённого сообщения и строки работ."""
+
+    __slots__ = ('message_id', 'entries', 'error', 'timer')
+
+    def __init__(self, message_id: int = None,
+                 entries: Dict[str, List[str]] = None) -> None:
+        """Начинаем с сохранённого табло, если оно есть."""
+        self.message_id = message_id
+        self.entries = entries if entries is not None else {}
+        self.error = None
+        self.timer: Optional[threading.Timer] = None
+
+
+class StatusBoard:
+    """Режим табло: одно закреплённое сообщение на чат.
+
+    Изменения статусов правятся в табло через `edit_message_text`,
+    а ошибки показываются в его последней строке вместо новых
+    сообщений. Если лимит велит подождать, правка откладывается
+    на таймер, а не задерживает цикл опроса; изменения, пришедшие
+    за время ожидания, уходят той же правкой.
+    """
+
+    def __init__(self, bot: 'Bot', limiter: RateLimiter = None,
+                 store: StateStore = None) -> None:
+        """Запоминаем бота, ограничитель и хранилище состояния."""
+        self.bot = bot
+        self.limiter = limiter
+        self.store = store
+        self.boards: Dict[str, ChatBoard] = {}
+        self.lock = threading.RLock()
+
+    def board(self, chat_id: str) -> ChatBoard:
+        """Табло чата, загруженное из хранилища при первом обращении."""
+        board = self.boards.get(chat_id)
+        if board is None:
+            saved = self.store.load_board(chat_id) if self.store else None
+            board = self.boards[chat_id] = ChatBoard(*(saved or ()))
+        return board
+
+    def apply(self, chat_id: str, changes: List[HomeworkRecord]) -> None:
+        """Внесение изменений в табло чата."""
+        with self.lock:
+            board = self.board(chat_id)
+            if not changes and board.error is None:
+                return
+            for homework in changes:
+                board.entries[homework.key] = [
+                    homework.homework_name, homework.status
+                ]
+            board.error = None
+        self.publish(chat_id, board)
+
+    def report_error(self, chat_id: str, error: str) -> None:
+        """Показ ошибки в табло вместо отдельного сообщения."""
+        with self.lock:
+            board = self.board(chat_id)
+            if board.error == error:
+                return
+            board.error = error
+        self.publish(chat_id, board)
+
+    def render(self, board: ChatBoard) -> str:
+        """Текст табло: по строке на работу и строка ошибки."""
+        lines = [BOARD_TITLE]
+        for name, status in board.entries.values():
+            mark = emoji(status) if status in HOMEWORK_STATES else (
+                UNKNOWN_STATUS
+            )
+            lines.append(f'{mark} {name}: {status}')
+        if board.error is not None:
+            lines.append(board.error)
+        return '\n'.join(lines)
+
+    def publish(self, chat_id: str, board: ChatBoard) -> None:
+        """Правка табло сразу или по таймеру, если лимит велит подождать."""
+        if self._throttle(chat_id, board):
+            self.send(chat_id, board)
+
+    def send(self, chat_id: str, board: ChatBoard) -> None:
+        """Правка табло или создание нового закреплённого сообщения."""
+        with self.lock:
+            board.timer = None
+            self._send(chat_id, board)
+
+    def deferred(self, chat_id: str, board: ChatBoard) -> None:
+        """Отложенная правка табло в потоке таймера."""
+        try:
+            self.send(chat_id, board)
+        except LogError as error:
+            logging.error(error)
+
+    def close(self) -> None:
+        """Досрочная отправка отложенных правок."""
+        with self.lock:
+            pending = [
+                (chat_id, board, board.timer)
+                for chat_id, board in self.boards.items()
+                if board.timer is not None
+            ]
+        for chat_id, board, timer in pending:
+            timer.cancel()
+            self.deferred(chat_id, board)
+
+    def _send(self, chat_id: str, board: ChatBoard) -> None:
+        from telegram.error import BadRequest, TelegramError
+
+        text = self.render(board)
+        try:
+            if board.message_id is not None:
+                try:
+                    self.bot.edit_message_text(
+                        text, chat_id=chat_id, message_id=board.message_id
+                    )
+                except BadRequest as error:
+                    if 'not modified' in str(error):
+                        return
+                    # Табло удалили из чата: создаём его заново.
+                    board.message_id = None
+            if board.message_id is None:
+                message = self.bot.send_message(
+                    chat_id, text=text, disable_notification=True
+                )
+                board.message_id = message.message_id
+                self.bot.pin_chat_message(
+                    chat_id, board.message_id, disable_notification=True
+                )
+        except TelegramError as error:
+            raise SendMessageError(f'Не удалось обновить табло: {error}')
+        if self.store is not None:
+            self.store.stage_board(chat_id, board.message_id, board.entries)
+        logging.info('Табло обновлено.')
+
+    def _throttle(self, chat_id: str, board: ChatBoard) -> bool:
+        if self.limiter is None:
+            return True
+        with self.lock:
+            # Уже запланированная правка покажет и эти изменения.
+            if board.timer is not None:
+                return False
+            wait = self.limiter.acquire(str(chat_id))
+            if wait < 0:
+                raise SendMessageError(
+                    f'Обновление табло в чате {chat_id} отброшено по лимиту.'
+                )
+            if not wait:
+                return True
+            board.timer = threading.Timer(
+                wait, self.deferred, args=(chat_id, board)
+            )
+            board.timer.daemon = True
+            board.timer.start()
+            return False
+
+
+def verdicts(changes: List[HomeworkRecord]) -> List[HomeworkRecord]:
+    """Изменения, о которых стоит присылать отдельное уведомление."""
+    return [homework for homework in changes if homework.status in VERDICTS]
@@ -0,0 +1,198 @@
+import os
+import sys
+import time
+import signal
+import bisect
+import hashlib
+import logging
+import multiprocessing
+from collections import defaultdict
+from typing import Dict, Hashable, Iterable, List
+
+import homework
+import tenants
+from tenants import Tenant
+from state_store import state_key
+from rate_limit import GLOBAL_RATE
+
+
+WORKERS = int(os.getenv('WORKERS', os.cpu_count() or 1))
+REPLICAS = 100
+CHECK_INTERVAL = 1
+RESTART_DELAY = 5
+
+
+def ring_point(key: str) -> int:
+    """Позиция ключа на кольце хешей."""
+    return int(hashlib.md5(key.encode()).hexdigest()[:16], 16)
+
+
+class HashRing:
+    """Консистентное хеширование с виртуальными узлами.
+
+    При добавлении узла к нему переезжает около 1/N ключей,
+    остальные остаются на прежних узлах.
+    """
+
+    def __init__(self, nodes: Iterable[Hashable],
+                 replicas: int = REPLICAS) -> None:
+        """Раскладываем по кольцу replicas точек на каждый узел."""
+        ring = sorted(
+            (ring_point(f'{node}:{replica}'), node)
+            for node in nodes
+            for replica in range(replicas)
+        )
+        self.points = [point for point, _ in ring]
+        self.nodes = [node for _, node in ring]
+
+    def node(self, key: str) -> Hashable:
+        """Узел, отвечающий за ключ."""
+        index = bisect.bisect(self.points, ring_point(key))
+        return self.nodes[index % len(self.nodes)]
+
+
+def chat_groups(registry: Iterable[Tenant]) -> List[List[Tenant]]:
+    """Группы получателей, связанных общими чатами."""
+    registry = list(registry)
+    parent = list(range(len(registry)))
+
+    def find(index: int) -> int:
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+
+    owners: Dict[str, int] = {}
+    for index, tenant in enumerate(registry):
+        for chat_id in tenant.chat_ids:
+            parent[find(index)] = find(owners.setdefault(chat_id, index))
+    groups = defaultdict(list)
+    for index, tenant in enumerate(registry):
+        groups[find(index)].append(tenant)
+    return list(groups.values())
+
+
+def assign(registry: Iterable[Tenant], workers: int,
+           by_chat: bool = False) -> Dict[int, List[Tenant]]:
+    """Распределение получателей по номерам процессов.
+
+    При by_chat получатели с общим чатом попадают в один процесс:
+    в режиме табло у чата одно закреплённое сообщение, и править его
+    должен один процесс.
+    """
+    ring = HashRing(range(workers))
+    shards = {worker: [] for worker in range(workers)}
+    if not by_chat:
+        for tenant in registry:
+            shards[ring.node(state_key(tenant.token))].append(tenant)
+        return shards
+    for group in chat_groups(registry):
+        chat_id = min(chat for tenant in group for chat in tenant.chat_ids)
+        shards[ring.node(f'chat:{chat_id}')].extend(group)
+    return shards
+
+
+def exit_worker(*args) -> None:
+    """Штатное завершение процесса с сохранением состояния."""
+    sys.exit(0)
+
+
+def worker_metrics_port(worker: int) -> int:
+    """Порт метрик процесса: METRICS_PORT плюс номер процесса."""
+    if not homework.METRICS_PORT:
+        return 0
+    return homework.METRICS_PORT + worker
+
+
+def run_worker(shard: List[Tenant], worker: int = 0,
+               global_rate: float = GLOBAL_RATE) -> None:
+    """Точка входа процесса: обычный опрос своей доли получателей."""
+    signal.signal(signal.SIGTERM, exit_worker)
+    tenants.serve(
+        shard, metrics_port=worker_metrics_port(worker),
+        global_rate=global_rate
+    )
+
+
+class Supervisor:
+    """Запуск процессов-опросчиков и перезапуск упавших.
+
+    Состояние получателей хранится в общей базе `StateStore`, поэтому
+    перезапущенный процесс продолжает с того же места. Общий лимит
+    отправки бота делится поровну между процессами. Лимит на чат
+    у каждого процесса свой: чат, подписанный на токены из разных
+    процессов, может получать сообщения чаще; в режиме табло такие
+    получатели собираются в одном процессе.
+    """
+
+    def __init__(self, shards: Dict[int, List[Tenant]]) -> None:
+        """Запоминаем доли получателей по процессам."""
+        self.shards = shards
+        busy = sum(1 for shard in shards.values() if shard)
+        self.global_rate = GLOBAL_RATE / max(busy, 1)
+        self.processes: Dict[int, multiprocessing.Process] = {}
+        self.running = True
+
+    def start(self, worker: int) -> None:
+        """Запуск процесса для доли worker."""
+        process = multiprocessing.Process(
+            target=run_worker,
+            args=(self.shards[worker], worker, self.global_rate),
+            name=f'worker-{worker}', daemon=True
+        )
+        process.start()
+        self.processes[worker] = process
+        logging.info(
+            f'Запущен {process.name}: {len(self.shards[worker])} получателей.'
+        )
+
+    def stop(self, *args) -> None:
+        """Остановка всех процессов."""
+        self.running = False
+        for process in self.processes.values():
+            process.terminate()
+        for process in self.processes.values():
+            process.join()
+
+    def run(self) -> None:
+        """Наблюдение за процессами до получения SIGTERM."""
+        for worker, shard in self.shards.items():
+            if shard:
+                self.start(worker)
+        while self.running:
+            time.sleep(CHECK_INTERVAL)
+            for worker, process in list(self.processes.items()):
+                if process.is_alive() or not self.running:
+                    continue
+                logging.error(
+                    f'{process.name} завершился с кодом {process.exitcode}, '
+                    'перезапускаем.'
+                )
+                time.sleep(RESTART_DELAY)
+                self.start(worker)
+
+
+def main(path: str = None, workers: int = WORKERS) -> None:
+    """Многопроцессный режим работы бота."""
+    # Процессы наследуют обработчик очереди и пишут в общий файл
+    # через слушателя в процессе-супервизоре.
+    homework.setup_logging(multiprocessing.Queue(-1))
+    homework.check_message_settings()
+    path = path or os.getenv('TENANTS_FILE')
+
+    if not (path and homework.TELEGRAM_TOKEN):
+        logging.critical('Не задан реестр получателей или токен бота.')
+        sys.exit('Ошибка, не задан TENANTS_FILE или TELEGRAM_TOKEN.')
+
+    supervisor = Supervisor(assign(
+        tenants.load_tenants(path), workers, by_chat=homework.STATUS_BOARD
+    ))
+    signal.signal(signal.SIGTERM, supervisor.stop)
+    try:
+        supervisor.run()
+    finally:
+        supervisor.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,299 @@
+import os
+import sys
+import time
+import json
+import logging
+import heapq
+import sqlite3
+from collections import namedtuple
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+
+import homework
+import metrics
+import startup
+from exceptions import APIError, LogError
+from scheduler import IntervalPolicy, PollSchedule, policy_from_env
+from state_store import StateStore, state_key
+from homework_diff import HomeworkIndex
+from homework_record import HomeworkRecord
+from response_cache import UnchangedResponse
+from rate_limit import GLOBAL_RATE, RateLimiter
+from status_board import StatusBoard, verdicts
+from error_cache import ErrorCache
+
+if TYPE_CHECKING:
+    from telegram import Bot
+
+
+SQLITE_SUFFIXES = ('.db', '.sqlite', '.sqlite3')
+FLUSH_INTERVAL = 5
+
+Tenant = namedtuple('Tenant', ('token', 'chat_ids'))
+
+
+class TenantState:
+    """Состояние опроса одного получателя."""
+
+    __slots__ = ('key', 'timestamp', 'index', 'schedule', 'errors')
+
+    def __init__(self, key: str, timestamp: int,
+                 known: Dict[str, Tuple[str, str]] = None,
+                 policy: IntervalPolicy = IntervalPolicy()) -> None:
+        """Запоминаем метку времени, известные статусы и расписание."""
+        self.key = key
+        self.timestamp = timestamp
+        self.index = HomeworkIndex(known)
+        self.schedule = PollSchedule(policy)
+        self.errors: Optional[ErrorCache] = None
+
+
+def group_subscriptions(pairs: Iterable[Tuple[str, str]]) -> List[Tenant]:
+    """Объединение подписок: один токен — один опрос на все его чаты."""
+    subscriptions: Dict[str, List[str]] = {}
+    for token, chat_id in pairs:
+        if not token or chat_id is None:
+            raise ValueError(
+                f'В записи реестра нет токена или чата: {chat_id!r}.'
+            )
+        chat_ids = subscriptions.setdefault(token, [])
+        if str(chat_id) not in chat_ids:
+            chat_ids.append(str(chat_id))
+    return [
+        Tenant(token, tuple(chat_ids))
+        for token, chat_ids in subscriptions.items()
+    ]
+
+
+def load_tenants(path: str) -> List[Tenant]:
+    """Загрузка реестра получателей из JSON-файла или базы SQLite.
+
+    Записи с одинаковым токеном объединяются в одну подписку.
+    """
+    if path.endswith(SQLITE_SUFFIXES):
+        with sqlite3.connect(path) as connection:
+            rows = connection.execute(
+                'SELECT token, chat_id FROM tenants'
+            ).fetchall()
+        return group_subscriptions(rows)
+
+    with open(path, encoding='utf-8') as file:
+        data = json.load(file)
+    if not isinstance(data, list):
+        raise TypeError('Реестр получателей должен быть списком.')
+    return group_subscriptions(
+        (item['token'], chat_id)
+        for item in data
+        for chat_id in (
+            item['chat_ids'] if 'chat_ids' in item else [item['chat_id']]
+        )
+    )
+
+
+def process_response(state: TenantState, response: dict,
+                     store: StateStore = None) -> List[HomeworkRecord]:
+    """Обновление состояния получателя по ответу API.
+
+    Возвращает все работы, статус которых изменился. Повтор прежнего
+    ответа не разбирается: сдвигается только метка времени.
+    """
+    if isinstance(response, UnchangedResponse):
+        state.schedule.record_success(())
+        state.timestamp = response['current_date']
+        if store is not None:
+            store.stage(state.key, state.timestamp)
+        return []
+    homework_list = homework.check_response(response)
+    state.schedule.record_success(hw.status for hw in homework_list)
+    changes = state.index.diff(homework_list)
+    state.index.update(changes)
+    state.timestamp = response['current_date']
+    if store is not None:
+        store.stage(state.key, state.timestamp)
+        store.stage_homeworks(state.key, changes)
+    return changes
+
+
+def poll_tenant(bot: 'Bot', tenant: Tenant, state: TenantState,
+                store: StateStore = None, board: StatusBoard = None) -> None:
+    """Один цикл опроса API и отправки уведомления для получателя."""
+    response = homework.request_homeworks(tenant.token, state.timestamp)
+    changes = process_response(state, response, store)
+    if board is not None:
+        for chat_id in tenant.chat_ids:
+            try:
+                board.apply(chat_id, changes)
+            except LogError as error:
+                logging.error(error)
+        changes = verdicts(changes)
+    for message in homework.build_messages(changes):
+        for chat_id in tenant.chat_ids:
+            try:
+                homework.send_message_to(bot, chat_id, message)
+            except LogError as error:
+                logging.error(error)
+
+
+def error_notice(state: TenantState, error: Exception) -> Optional[str]:
+    """Текст уведомления об ошибке, если его не нужно подавить."""
+    if state.errors is None:
+        state.errors = ErrorCache()
+    return state.errors.record(error)
+
+
+def recovery_notice(state: TenantState) -> Optional[str]:
+    """Текст уведомления о восстановлении после ошибок."""
+    if state.errors is None:
+        return None
+    notice = state.errors.recover()
+    state.errors = None
+    return notice
+
+
+def notify(bot: 'Bot', tenant: Tenant, text: str,
+           board: StatusBoard = None) -> None:
+    """Служебное уведомление во все чаты подписки."""
+    for chat_id in tenant.chat_ids:
+        try:
+            if board is not None:
+                board.report_error(chat_id, text)
+            else:
+                homework.send_message_to(
+                    bot, chat_id, homework.renderer.escape(text)
+                )
+        except LogError as error:
+            logging.error(error)
+
+
+def poll_safely(bot: 'Bot', tenant: Tenant, state: TenantState,
+                store: StateStore = None, board: StatusBoard = None) -> None:
+    """Опрос получателя с обработкой и уведомлением об ошибках."""
+    try:
+        poll_tenant(bot, tenant, state, store, board)
+    except LogError as error:
+        logging.error(error)
+    except Exception as error:
+        if isinstance(error, APIError):
+            state.schedule.record_failure()
+        logging.error(error)
+        notice = error_notice(state, error)
+        if notice is not None:
+            notify(bot, tenant, notice, board)
+    else:
+        # Табло само убирает строку ошибки при следующем обновлении.
+        notice = recovery_notice(state)
+        if notice is not None and board is None:
+            notify(bot, tenant, notice)
+
+
+def poll_all(bot: 'Bot', states: Dict[Tenant, TenantState],
+             store: StateStore = None, board: StatusBoard = None) -> None:
+    """Опрос всех получателей через общий экземпляр бота."""
+    for tenant, state in states.items():
+        poll_safely(bot, tenant, state, store, board)
+    if store is not None:
+        store.flush()
+
+
+def run(bot: 'Bot', states: Dict[Tenant, TenantState],
+        store: StateStore = None, board: StatusBoard = None) -> None:
+    """Опрос каждого получателя по его собственному расписанию.
+
+    Состояние сохраняется перед простоем, а если опросы идут без
+    пауз — не реже раза в FLUSH_INTERVAL секунд и раза за круг.
+    """
+    queue = [(0.0, index, tenant) for index, tenant in enumerate(states)]
+    heapq.heapify(queue)
+    flushed_at, polls = time.monotonic(), 0
+    while queue:
+        due, index, tenant = heapq.heappop(queue)
+        now = time.monotonic()
+        delay = due - now
+        if store is not None and polls and (
+            delay > 0 or polls >= len(states)
+            or now - flushed_at >= FLUSH_INTERVAL
+        ):
+            store.flush()
+            flushed_at, polls = now, 0
+        if delay > 0:
+            time.sleep(delay)
+        state = states[tenant]
+        poll_safely(bot, tenant, state, store, board)
+        polls += 1
+        if startup.report.mark('first_poll'):
+            logging.info(startup.report.summary())
+        heapq.heappush(queue, (
+            time.monotonic() + state.schedule.next_delay(), index, tenant
+        ))
+
+
+def init_states(tenants: Iterable[Tenant],
+                policy: IntervalPolicy = IntervalPolicy(),
+                store: StateStore = None) -> Dict[Tenant, TenantState]:
+    """Создание состояния получателей с учётом сохранённого."""
+    timestamp = int(time.time())
+    states = {}
+    for tenant in tenants:
+        key = state_key(tenant.token)
+        if store is None:
+            states[tenant] = TenantState(key, timestamp, policy=policy)
+            continue
+        states[tenant] = TenantState(
+            key, store.load(key) or timestamp, store.load_homeworks(key),
+            policy
+        )
+    return states
+
+
+def serve(registry: List[Tenant], metrics_port: int = None,
+          global_rate: float = GLOBAL_RATE) -> None:
+    """Запуск опроса получателей до остановки процесса.
+
+    global_rate — доля общего лимита бота, доступная этому процессу.
+    """
+    metrics_port = (
+        homework.METRICS_PORT if metrics_port is None else metrics_port
+    )
+    if metrics_port:
+        metrics.serve(metrics_port)
+    store = StateStore(homework.STATE_FILE)
+    states = init_states(
+        registry, policy_from_env(homework.RETRY_TIME), store
+    )
+    homework.api_client.open()
+    from telegram import Bot
+
+    limiter = RateLimiter(
+        Bot(token=homework.TELEGRAM_TOKEN, base_url=homework.TELEGRAM_API_URL),
+        global_rate=global_rate
+    )
+    bot = homework.create_sender(limiter)
+    board = None
+    if homework.STATUS_BOARD:
+        board = StatusBoard(limiter.bot, limiter, store)
+    logging.info(f'Загружено получателей: {len(states)}.')
+    startup.report.mark('config')
+
+    try:
+        run(bot, states, store, board)
+    finally:
+        if board is not None:
+            board.close()
+        bot.close()
+        store.close()
+
+
+def main(path: str = None) -> None:
+    """Опрос всех получателей из реестра в одном процессе."""
+    homework.setup_logging()
+    homework.check_message_settings()
+    path = path or os.getenv('TENANTS_FILE')
+
+    if not (path and homework.TELEGRAM_TOKEN):
+        logging.critical('Не задан реестр получателей или токен бота.')
+        sys.exit('Ошибка, не задан TENANTS_FILE или TELEGRAM_TOKEN.')
+
+    serve(load_tenants(path))
+
+
+if __name__ == '__main__':
+    main()
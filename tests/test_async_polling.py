@@ -0,0 +1,114 @@
+import json
+import asyncio
+from http import HTTPStatus
+
+import pytest
+
+import async_polling
+from exceptions import APIError
+from tenants import Tenant, TenantState
+
+
+class MockResponse:
+
+    def __init__(self, status, data=None):
+        self.status = status
+        self.data = data
+        self.headers = {}
+
+    async def json(self):
+        return self.data
+
+    async def read(self):
+        return json.dumps(self.data).encode()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+
+class MockSession:
+
+    def __init__(self, status=HTTPStatus.OK, data=None):
+        self.status = status
+        self.data = data
+        self.sent = []
+
+    def get(self, url, headers=None, params=None):
+        assert headers['Authorization'].startswith('OAuth ')
+        assert 'from_date' in params
+        return MockResponse(self.status, self.data)
+
+    def post(self, url, json=None):
+        self.sent.append(json)
+        return MockResponse(HTTPStatus.OK)
+
+
+class TestAsyncPolling:
+
+    def test_poll_tenant_async(self, random_timestamp):
+        session = MockSession(data={
+            'homeworks': [{'homework_name': 'hw123', 'status': 'approved'}],
+            'current_date': random_timestamp,
+        })
+        state = TenantState('key', 0)
+        asyncio.run(async_polling.poll_tenant_async(
+            session, Tenant('token', ('1',)), state, asyncio.Semaphore(1)
+        ))
+        assert state.timestamp == random_timestamp
+        assert len(session.sent) == 1, (
+            'Проверьте, что при смене статуса отправляется уведомление'
+        )
+        assert session.sent[0]['chat_id'] == '1'
+
+    def test_get_api_answer_async_error(self):
+        session = MockSession(status=HTTPStatus.INTERNAL_SERVER_ERROR)
+        with pytest.raises(APIError):
+            asyncio.run(
+                async_polling.get_api_answer_async(session, 'token', 0)
+            )
+
+    def test_startup_spread(self):
+        assert async_polling.startup_spread(1) == 0, (
+            'При нескольких получателях первый опрос не должен откладываться'
+        )
+        assert async_polling.startup_spread(500, rate=50) == 10
+        assert async_polling.startup_spread(10 ** 6) == (
+            async_polling.homework.RETRY_TIME
+        )
+
+    def test_notice_failure_does_not_stop_loop(self):
+        class BrokenSession(MockSession):
+            def post(self, url, json=None):
+                raise RuntimeError('сессия закрыта')
+
+        asyncio.run(async_polling.notify_async(
+            BrokenSession(), Tenant('token', ('notice-1',)), 'Сбой'
+        ))
+
+    def test_no_pause_after_last_retry(self, monkeypatch):
+        pauses = []
+
+        async def mock_sleep(delay):
+            pauses.append(delay)
+
+        class ThrottledSession(MockSession):
+            def post(self, url, json=None):
+                self.sent.append(json)
+                return MockResponse(
+                    HTTPStatus.TOO_MANY_REQUESTS,
+                    {'parameters': {'retry_after': 3}}
+                )
+
+        monkeypatch.setattr(async_polling.asyncio, 'sleep', mock_sleep)
+        session = ThrottledSession()
+        with pytest.raises(async_polling.SendMessageError):
+            asyncio.run(async_polling.send_message_async(
+                session, 'retry-1', 'текст'
+            ))
+        assert len(session.sent) == async_polling.MAX_SEND_RETRIES
+        assert pauses.count(3) == async_polling.MAX_SEND_RETRIES - 1, (
+            'После последней попытки ждать retry_after не нужно'
+        )
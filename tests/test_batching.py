@@ -0,0 +1,61 @@
+import homework
+from batching import Coalescer, coalesce, split_message
+from homework_record import make_record
+
+
+class MockBot:
+
+    def __init__(self):
+        self.sent = []
+
+    def send_message(self, chat_id=None, text=None, **kwargs):
+        self.sent.append((chat_id, text))
+
+
+class TestBatching:
+
+    def test_coalesce_respects_limit(self):
+        messages = ['a' * 40, 'b' * 40, 'c' * 40]
+        batches = coalesce(messages, limit=100)
+        assert batches == ['a' * 40 + '\n\n' + 'b' * 40, 'c' * 40], (
+            'Уведомления должны склеиваться, не превышая лимит длины'
+        )
+        assert coalesce(['x' * 250], limit=100) == [
+            'x' * 100, 'x' * 100, 'x' * 50
+        ]
+
+    def test_split_keeps_escapes_whole(self):
+        assert split_message('aaa bbb ccc', limit=5) == ['aaa ', 'bbb ', 'ccc']
+        chunks = split_message('x' * 4 + '\\.' + 'y' * 4, limit=5)
+        assert chunks[0] == 'xxxx', (
+            'Кусок не должен обрываться посреди экранированного символа'
+        )
+        assert ''.join(chunks) == 'xxxx\\.yyyy'
+        chunks = split_message('abc&lt;def', limit=5)
+        assert chunks[:2] == ['abc', '&lt;d'], (
+            'Кусок не должен обрываться посреди HTML-сущности'
+        )
+        assert all(len(chunk) <= 5 for chunk in chunks)
+
+    def test_build_messages_single_batch(self):
+        changes = [
+            make_record({'homework_name': 'hw1', 'status': 'approved'}),
+            make_record({'homework_name': 'hw2', 'status': 'rejected'}),
+        ]
+        messages = homework.build_messages(changes)
+        assert len(messages) == 1, (
+            'Изменения за один цикл должны уходить одним сообщением'
+        )
+        assert '"hw1"' in messages[0] and '"hw2"' in messages[0]
+
+    def test_coalescer_window(self):
+        bot = MockBot()
+        coalescer = Coalescer(bot, window=60)
+        coalescer.send_message('1', text='first')
+        coalescer.send_message('1', text='second')
+        coalescer.send_message('2', text='other')
+        assert not bot.sent
+        coalescer.close()
+        assert sorted(bot.sent) == [
+            ('1', 'first\n\nsecond'), ('2', 'other')
+        ]
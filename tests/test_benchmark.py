@@ -0,0 +1,35 @@
+import benchmark
+
+
+class TestBenchmark:
+
+    def test_scenario(self):
+        result = benchmark.run_scenario(3)
+        assert result['tenants'] == 3
+        assert result['delivered'] == 3, (
+            'Проверьте, что каждое изменение статуса доходит до телеграма'
+        )
+        assert result['polls_per_sec'] > 0
+        assert set(result['notification_latency_ms']) == {
+            'p50', 'p95', 'p99', 'max'
+        }
+
+    def test_scenarios_back_to_back(self):
+        first = benchmark.run_scenario(2)
+        second = benchmark.run_scenario(4)
+        assert (first['delivered'], second['delivered']) == (2, 4), (
+            'Проверьте, что сценарии не делят кэш ответов и предохранитель'
+        )
+
+    def test_compare(self):
+        old = {'scenarios': [{
+            'tenants': 1, 'polls_per_sec': 100,
+            'notification_latency_ms': {'p99': 5},
+        }]}
+        new = {'scenarios': [{
+            'tenants': 1, 'polls_per_sec': 50,
+            'notification_latency_ms': {'p99': 7},
+        }]}
+        assert benchmark.compare(new, old) == [
+            '1 получателей: опросы/с -50.0%, p99 5 → 7 мс'
+        ]
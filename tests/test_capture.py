@@ -0,0 +1,54 @@
+import pytest
+
+from capture import TrafficRecorder, read_capture, replay
+
+
+def fake_request(token, from_date):
+    if from_date < 0:
+        raise ValueError('bad from_date')
+    return {
+        'homeworks': [{
+            'id': 1, 'homework_name': 'hw', 'status': 'approved',
+            'reviewer_comment': 'ok',
+        }],
+        'current_date': 100,
+    }
+
+
+class TestCapture:
+
+    def test_record_and_replay(self, tmp_path):
+        path = tmp_path / 'capture.ndjson'
+        recorder = TrafficRecorder(str(path))
+        recorder.record_api(fake_request, 'secret', 0)
+        recorder.record_api(fake_request, 'secret', 100)
+        with pytest.raises(ValueError):
+            recorder.record_api(fake_request, 'secret', -1)
+        recorder.record_send(1, 'text')
+        recorder.close()
+
+        assert 'secret' not in path.read_text(encoding='utf-8'), (
+            'Токен не должен попадать в файл записи'
+        )
+        records = list(read_capture(str(path)))
+        assert [record['kind'] for record in records] == [
+            'api', 'api', 'api', 'send'
+        ]
+        assert 'error' in records[2]
+
+        summary = replay(iter(records))
+        assert summary['responses'] == 3
+        assert summary['messages'] == 1, (
+            'Повторный ответ без изменений не должен давать уведомление'
+        )
+        assert summary['tenants'] == 1
+
+    def test_replay_counts_invalid_responses(self):
+        records = [{
+            'ts': 0, 'kind': 'api', 'tenant': 'a', 'from_date': 0,
+            'response': {'homeworks': {}},
+        }]
+        summary = replay(iter(records))
+        assert summary['errors'] == {
+            'TypeError: Дз получено не в виде списка.': 1
+        }
@@ -0,0 +1,81 @@
+from http import HTTPStatus
+
+import pytest
+import requests
+
+import circuit_breaker
+from circuit_breaker import CircuitBreaker
+from exceptions import APIError, CircuitOpenError
+from practicum_client import PracticumClient
+
+
+class MockResponse:
+
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+    def json(self):
+        return {'homeworks': [], 'current_date': 1}
+
+
+class TestCircuitBreaker:
+
+    def test_open_half_open_closed(self, monkeypatch):
+        clock = [0.0]
+        monkeypatch.setattr(circuit_breaker.time, 'monotonic', lambda: clock[0])
+        breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=10)
+
+        for _ in range(2):
+            breaker.before_call()
+            breaker.record_failure()
+        assert breaker.state == circuit_breaker.OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+
+        clock[0] = 10
+        breaker.before_call()
+        assert breaker.state == circuit_breaker.HALF_OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+        breaker.record_failure()
+        assert breaker.state == circuit_breaker.OPEN, (
+            'Неудачная проба должна снова размыкать цепь'
+        )
+
+        clock[0] = 20
+        breaker.before_call()
+        breaker.record_success()
+        assert breaker.state == circuit_breaker.CLOSED
+
+    def test_client_skips_requests_while_open(self, monkeypatch, api_url):
+        calls = []
+
+        def mock_get(*args, **kwargs):
+            calls.append(kwargs)
+            return MockResponse(HTTPStatus.INTERNAL_SERVER_ERROR)
+
+        monkeypatch.setattr(requests, 'get', mock_get)
+        client = PracticumClient(
+            api_url, breaker=CircuitBreaker(failure_threshold=2)
+        )
+        for _ in range(2):
+            with pytest.raises(APIError):
+                client.get_homeworks('token', 0)
+        with pytest.raises(CircuitOpenError):
+            client.get_homeworks('token', 0)
+        assert len(calls) == 2, (
+            'При разомкнутой цепи запросы к API не должны отправляться'
+        )
+
+    def test_client_errors_do_not_trip(self, monkeypatch, api_url):
+        monkeypatch.setattr(
+            requests, 'get',
+            lambda *args, **kwargs: MockResponse(HTTPStatus.UNAUTHORIZED)
+        )
+        breaker = CircuitBreaker(failure_threshold=1)
+        client = PracticumClient(api_url, breaker=breaker)
+        with pytest.raises(APIError):
+            client.get_homeworks('bad-token', 0)
+        assert breaker.state == circuit_breaker.CLOSED, (
+            'Ошибка одного токена не должна размыкать цепь для всех'
+        )
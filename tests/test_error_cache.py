@@ -0,0 +1,48 @@
+from error_cache import ErrorCache
+from exceptions import APIError
+
+
+class TestErrorCache:
+
+    def test_first_then_summary_then_recovery(self):
+        cache = ErrorCache(summary_interval=3600, ttl=86400)
+        error = ConnectionError('API недоступно')
+
+        assert cache.record(error, now=0).startswith('Cбой в программе')
+        for second in range(1, 37):
+            assert cache.record(error, now=second) is None, (
+                'Повторы одной ошибки не должны отправляться сразу'
+            )
+        summary = cache.record(error, now=7200)
+        assert 'повторился 37 раз' in summary
+        assert 'за последние 2 ч.' in summary
+        assert cache.recover() is not None
+        assert cache.recover() is None
+
+    def test_different_errors_and_ttl(self):
+        cache = ErrorCache(summary_interval=3600, ttl=100)
+        assert cache.record(KeyError('a'), now=0) is not None
+        assert cache.record(KeyError('b'), now=1) is not None, (
+            'Разные ошибки должны отправляться отдельно'
+        )
+        assert cache.record(KeyError('a'), now=500) is not None, (
+            'Ошибка после истечения TTL считается новой'
+        )
+
+    def test_wrapped_connection_errors_are_one_error(self):
+        cache = ErrorCache()
+
+        def outage(address):
+            cause = ConnectionError(
+                f'<urllib3.connection.HTTPSConnection object at {address}>: '
+                'Failed to establish a new connection'
+            )
+            return APIError(cause, 'Ошибка при получении ответа от API.')
+
+        assert cache.record(outage('0x7f0a1'), now=0) is not None
+        assert cache.record(outage('0x7f0b2'), now=1) is None, (
+            'Повтор сбоя соединения не должен считаться новой ошибкой '
+            'из-за адреса объекта в тексте'
+        )
+        assert cache.record(APIError('Сервер сервиса не дал ответа. 502.'),
+                            now=2) is not None
@@ -0,0 +1,100 @@
+import csv
+import json
+
+import pytest
+
+import homework
+from export import Exporter, load_watermarks
+from fake_servers import Event, FakePracticum
+from state_store import StateStore, state_key
+from tenants import Tenant
+
+
+def make_timeline(tokens, size):
+    return {token: [
+        Event(0, {'id': index, 'homework_name': f'{token}-{index}',
+                  'status': 'approved'})
+        for index in range(size)
+    ] for token in tokens}
+
+
+class TestExport:
+
+    def test_resume_after_interruption(self, monkeypatch, tmp_path):
+        registry = [Tenant(f'token-{index}', ()) for index in range(3)]
+        path = tmp_path / 'history.ndjson'
+        with FakePracticum(
+            make_timeline([t.token for t in registry], 5)
+        ) as server:
+            monkeypatch.setattr(homework.api_client, 'endpoint',
+                                server.endpoint)
+            exporter = Exporter(str(path))
+            exporter.export_tenant(registry[0])
+            exporter.close()
+            with open(path, 'a', encoding='utf-8') as file:
+                file.write('{"tenant": "обрыв')
+
+            exporter = Exporter(str(path))
+            assert exporter.run(registry, concurrency=2) == 0
+            exporter.close()
+
+        rows = [json.loads(line) for line in path.read_text().splitlines()]
+        assert len(rows) == 15, (
+            'После перезапуска недописанный хвост должен отбрасываться, '
+            'а выгруженные получатели не должны повторяться'
+        )
+        assert len({row['homework_name'] for row in rows}) == 15
+
+    def test_existing_output_without_checkpoint(self, tmp_path):
+        path = tmp_path / 'history.ndjson'
+        path.write_text('{"tenant": "готовая выгрузка"}\n')
+        with pytest.raises(FileExistsError):
+            Exporter(str(path))
+        assert path.read_text() == '{"tenant": "готовая выгрузка"}\n', (
+            'Без контрольной точки существующая выгрузка не должна меняться'
+        )
+
+        exporter = Exporter(str(path), overwrite=True)
+        exporter.close()
+        assert path.read_text() == ''
+
+    def test_since_watermark(self, monkeypatch, tmp_path):
+        timeline = {'token': [
+            Event(-100 * index, {'id': index, 'homework_name': f'hw{index}',
+                                 'status': 'approved'})
+            for index in range(1, 4)
+        ]}
+        store = StateStore(str(tmp_path / 'state.db'))
+        store.stage(state_key('token'), 1000000 - 250)
+        store.close()
+        registry = [Tenant('token', ())]
+        watermarks = load_watermarks(registry, str(tmp_path / 'state.db'))
+
+        path = tmp_path / 'history.ndjson'
+        with FakePracticum(timeline, clock=lambda: 1000000) as server:
+            monkeypatch.setattr(homework.api_client, 'endpoint',
+                                server.endpoint)
+            exporter = Exporter(str(path), watermarks=watermarks)
+            exporter.run(registry)
+            exporter.close()
+
+        rows = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [row['homework_name'] for row in rows] == ['hw1', 'hw2'], (
+            'Выгружаться должны только работы новее сохранённой метки'
+        )
+
+    def test_csv(self, monkeypatch, tmp_path):
+        path = tmp_path / 'history.csv'
+        with FakePracticum(make_timeline(['token'], 2)) as server:
+            monkeypatch.setattr(homework.api_client, 'endpoint',
+                                server.endpoint)
+            exporter = Exporter(str(path), 'csv')
+            exporter.run([Tenant('token', ())])
+            exporter.close()
+
+        with open(path, newline='', encoding='utf-8') as file:
+            rows = list(csv.DictReader(file))
+        assert sorted(row['homework_name'] for row in rows) == [
+            'token-0', 'token-1'
+        ]
+        assert rows[0]['status'] == 'approved'
@@ -0,0 +1,65 @@
+import pytest
+from telegram import Bot
+from telegram.error import RetryAfter
+
+from circuit_breaker import CircuitBreaker
+from exceptions import APIError
+from fake_servers import DROP, Event, Faults, FakePracticum, FakeTelegram
+from practicum_client import PracticumClient
+
+
+class Clock:
+
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class TestFakeServers:
+
+    def test_practicum_timeline(self):
+        clock = Clock(1000)
+        timeline = {'token': [
+            Event(0, {'id': 1, 'homework_name': 'hw', 'status': 'reviewing'}),
+            Event(60, {'id': 1, 'homework_name': 'hw', 'status': 'approved'}),
+        ]}
+        with FakePracticum(timeline, clock=clock) as server:
+            client = PracticumClient(server.endpoint)
+            client.open()
+            first = client.get_homeworks('token', 0)
+            clock.now = 1060
+            second = client.get_homeworks('token', first['current_date'])
+            client.close()
+
+        assert [hw['status'] for hw in first['homeworks']] == ['reviewing']
+        assert [hw['status'] for hw in second['homeworks']] == ['approved'], (
+            'Проверьте, что сервер отдаёт только изменения после from_date'
+        )
+        assert second['current_date'] == 1060
+
+    def test_practicum_faults(self):
+        breaker = CircuitBreaker(failure_threshold=2)
+        faults = Faults([500, DROP])
+        with FakePracticum({'token': []}, faults=faults) as server:
+            client = PracticumClient(server.endpoint, breaker=breaker)
+            client.open()
+            for _ in range(2):
+                with pytest.raises(APIError):
+                    client.get_homeworks('token', 0)
+            client.close()
+        assert breaker.state == 'open', (
+            'Ответ 500 и обрыв соединения должны учитываться предохранителем'
+        )
+
+    def test_telegram_send_and_429(self):
+        with FakeTelegram(faults=Faults([429]), retry_after=3) as server:
+            bot = Bot('1234:abcdefg', base_url=server.base_url)
+            with pytest.raises(RetryAfter) as error:
+                bot.send_message(42, text='первое')
+            assert error.value.retry_after == 3
+            message = bot.send_message(42, text='второе')
+
+        assert message.text == 'второе'
+        assert [int(data['chat_id']) for data in server.sent] == [42]
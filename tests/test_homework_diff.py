@@ -0,0 +1,33 @@
+from homework_diff import HomeworkIndex
+from homework_record import make_record
+
+
+class TestHomeworkIndex:
+
+    def test_every_transition_is_reported(self):
+        index = HomeworkIndex()
+        homeworks = [make_record(homework) for homework in (
+            {'id': 1, 'status': 'reviewing', 'date_updated': 'd1'},
+            {'id': 2, 'status': 'approved', 'date_updated': 'd1'},
+        )]
+        changes = index.diff(homeworks)
+        assert changes == homeworks, (
+            'Проверьте, что изменения ищутся во всех работах ответа, '
+            'а не только в первой'
+        )
+        index.update(changes)
+        assert index.diff(homeworks) == []
+
+        homeworks[0] = make_record(
+            {'id': 1, 'status': 'rejected', 'date_updated': 'd2'}
+        )
+        assert index.diff(homeworks) == [homeworks[0]]
+
+    def test_same_status_new_date(self):
+        index = HomeworkIndex({'1': ('rejected', 'd1')})
+        homework = make_record(
+            {'id': 1, 'status': 'rejected', 'date_updated': 'd2'}
+        )
+        assert index.diff([homework]) == [homework], (
+            'Повторный вердикт с новой датой тоже должен попадать в изменения'
+        )
@@ -0,0 +1,36 @@
+import pytest
+
+from exceptions import CheckResponseLogError
+from homework_record import HomeworkRecord, make_record, parse_response
+
+
+class TestHomeworkRecord:
+
+    def test_parse_response(self):
+        records = parse_response({
+            'homeworks': [
+                {'id': 7, 'homework_name': 'hw', 'status': ''.join('approved'),
+                 'date_updated': 'd1', 'reviewer_comment': 'ok'},
+                {'homework_name': 'other', 'status': 'reviewing'},
+            ],
+            'current_date': 100,
+        })
+        assert records[0] == HomeworkRecord('7', 'hw', 'approved', 'd1', 'ok')
+        assert records[1].key == 'other', (
+            'Без id ключом работы должно быть её название'
+        )
+        assert records[0].status is make_record(
+            {'status': 'approved'}
+        ).status, 'Статусы должны интернироваться'
+
+    @pytest.mark.parametrize('response, error', [
+        ([], TypeError),
+        ({'current_date': 1}, KeyError),
+        ({'homeworks': {}, 'current_date': 1}, TypeError),
+        ({'homeworks': []}, CheckResponseLogError),
+        ({'homeworks': [], 'current_date': '1'}, CheckResponseLogError),
+        ({'homeworks': ['hw'], 'current_date': 1}, TypeError),
+    ])
+    def test_invalid_response(self, response, error):
+        with pytest.raises(error):
+            parse_response(response)
@@ -0,0 +1,96 @@
+import json
+
+import pytest
+
+from exceptions import CheckResponseLogError
+from fake_servers import Event, FakePracticum
+from homework_record import parse_response
+from homework_stream import HomeworkStream, until_watermark
+from practicum_client import PracticumClient
+
+
+RESPONSE = {
+    'current_date': 1700000000,
+    'homeworks': [
+        {'id': 3, 'homework_name': 'ёж', 'status': 'approved',
+         'date_updated': '2023-11-10T00:00:00Z', 'score': 12.5},
+        {'id': 2, 'homework_name': 'hw2', 'status': 'rejected',
+         'date_updated': '2023-11-05T00:00:00Z', 'reviewer_comment': None},
+        {'id': 1, 'homework_name': 'hw1', 'status': 'approved',
+         'date_updated': '2023-11-01T00:00:00Z'},
+    ],
+}
+
+
+def chunked(data, size):
+    body = json.dumps(data, ensure_ascii=False, indent=1).encode()
+    return [body[index:index + size] for index in range(0, len(body), size)]
+
+
+class TestHomeworkStream:
+
+    @pytest.mark.parametrize('size', [1, 7, 4096])
+    def test_same_as_parse_response(self, size):
+        stream = HomeworkStream(chunked(RESPONSE, size))
+        assert list(stream) == parse_response(RESPONSE), (
+            'Потоковый разбор должен давать те же записи, что check_response'
+        )
+        assert stream.current_date == RESPONSE['current_date']
+
+    def test_stops_at_watermark(self):
+        consumed = []
+
+        def chunks():
+            for chunk in chunked(RESPONSE, 16):
+                consumed.append(chunk)
+                yield chunk
+
+        # 2023-11-05T00:00:00Z
+        records = list(until_watermark(HomeworkStream(chunks()), 1699142400))
+        assert [record.key for record in records] == ['3']
+        assert len(consumed) < len(chunked(RESPONSE, 16)), (
+            'Чтение должно прекращаться на работах старше метки'
+        )
+
+    @pytest.mark.parametrize('body, error', [
+        (b'[]', TypeError),
+        (b'{"current_date": 1}', KeyError),
+        (b'{"homeworks": {}, "current_date": 1}', TypeError),
+        (b'{"homeworks": [1], "current_date": 1}', TypeError),
+        (b'{"homeworks": []}', CheckResponseLogError),
+        (b'{"homeworks": [{"id": 1}', CheckResponseLogError),
+    ])
+    def test_invalid(self, body, error):
+        with pytest.raises(error):
+            list(HomeworkStream([body]))
+
+    def test_malformed_element_fails_fast(self):
+        consumed = []
+
+        def chunks():
+            yield b'{"homeworks": [{"id": 1, "status": oops}'
+            for _ in range(1000):
+                consumed.append(1)
+                yield b', {"id": 2, "status": "approved"}'
+
+        stream = HomeworkStream(chunks())
+        with pytest.raises(CheckResponseLogError):
+            list(stream)
+        assert len(consumed) <= 1 and len(stream.buffer) < 100, (
+            'Испорченная работа не должна дочитывать весь ответ в буфер'
+        )
+
+    def test_client_stream(self):
+        timeline = {'token': [
+            Event(0, {'id': index, 'homework_name': f'hw{index}',
+                      'status': 'approved'})
+            for index in range(50)
+        ]}
+        with FakePracticum(timeline) as server:
+            client = PracticumClient(server.endpoint)
+            client.open()
+            with client.stream_homeworks('token') as stream:
+                records = list(stream)
+            client.close()
+        assert len(records) == 50
+        assert stream.current_date is not None
@@ -0,0 +1,44 @@
+import gzip
+import json
+import logging
+
+import pytest
+
+from logging_setup import configure_logging
+
+
+@pytest.fixture
+def root_logger():
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    yield root
+    root.handlers[:] = handlers
+    root.setLevel(level)
+
+
+class TestLoggingSetup:
+
+    def test_json_records(self, root_logger, tmp_path):
+        path = tmp_path / 'main.log'
+        listener = configure_logging(str(path), as_json=True)
+        logging.info('Привет')
+        listener.stop()
+
+        record = json.loads(path.read_text(encoding='utf-8'))
+        assert record['message'] == 'Привет'
+        assert record['level'] == 'INFO'
+
+    def test_rotation_compresses_archive(self, root_logger, tmp_path):
+        path = tmp_path / 'main.log'
+        path.write_text('старая запись\n', encoding='utf-8')
+        listener = configure_logging(str(path), max_bytes=200)
+        for number in range(10):
+            logging.info(f'запись {number}')
+        listener.stop()
+
+        archives = sorted(tmp_path.glob('main.log.*.gz'))
+        assert archives, 'Проверьте, что архив лога сжимается'
+        with gzip.open(archives[-1], 'rt', encoding='utf-8') as file:
+            assert 'старая запись' in file.read(), (
+                'Лог не должен затираться при перезапуске'
+            )
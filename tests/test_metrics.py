@@ -0,0 +1,53 @@
+import urllib.request
+
+import pytest
+
+import homework
+import metrics
+from metrics import Histogram, Registry, track
+
+
+class TestMetrics:
+
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = Histogram('test_seconds', 'Тест.', buckets=(0.1, 1))
+        for value in (0.05, 0.5, 5):
+            histogram.observe(value)
+        assert histogram.samples() == [
+            'test_seconds_bucket{le="0.1"} 1',
+            'test_seconds_bucket{le="1"} 2',
+            'test_seconds_bucket{le="+Inf"} 3',
+            'test_seconds_sum 5.55',
+            'test_seconds_count 3',
+        ]
+
+    def test_track_counts_errors(self):
+        registry = Registry()
+        histogram = registry.histogram('op_seconds', 'Операция.')
+        errors = registry.counter('op_errors_total', 'Ошибки.')
+        with pytest.raises(KeyError):
+            with track(histogram, errors):
+                raise KeyError
+        assert histogram.count == 1 and errors.value == 1
+        assert '# TYPE op_errors_total counter' in registry.render()
+
+    def test_check_response_is_tracked(self):
+        before = metrics.VALIDATE_ERRORS.value
+        with pytest.raises(TypeError):
+            homework.check_response([])
+        assert metrics.VALIDATE_ERRORS.value == before + 1, (
+            'Проверьте, что ошибки проверки ответа учитываются в метриках'
+        )
+
+    def test_endpoint(self):
+        server = metrics.serve(0)
+        try:
+            port = server.server_address[1]
+            with urllib.request.urlopen(
+                f'http://127.0.0.1:{port}/metrics'
+            ) as response:
+                body = response.read().decode()
+        finally:
+            server.shutdown()
+            server.server_close()
+        assert 'homework_api_request_seconds_count' in body
@@ -0,0 +1,79 @@
+import logging
+import threading
+
+from telegram.error import RetryAfter, TimedOut
+
+import outbox
+from outbox import Outbox
+from rate_limit import RateLimiter
+
+
+class MockBot:
+
+    def __init__(self, failures=()):
+        self.failures = list(failures)
+        self.sent = []
+        self.lock = threading.Lock()
+
+    def send_message(self, chat_id=None, text=None, **kwargs):
+        with self.lock:
+            if self.failures:
+                raise self.failures.pop(0)
+            self.sent.append((chat_id, text))
+
+
+class TestOutbox:
+
+    def test_per_chat_order(self):
+        bot = MockBot()
+        box = Outbox(bot, workers=3)
+        for number in range(50):
+            box.send_message(str(number % 5), text=str(number))
+        box.close()
+
+        assert len(bot.sent) == 50
+        for chat in map(str, range(5)):
+            texts = [int(text) for chat_id, text in bot.sent if chat_id == chat]
+            assert texts == sorted(texts), (
+                'Сообщения одного чата должны уходить в порядке постановки'
+            )
+
+    def test_retry_after_and_network_errors(self, monkeypatch):
+        pauses = []
+        monkeypatch.setattr(outbox.time, 'sleep', pauses.append)
+        bot = MockBot([RetryAfter(7), TimedOut()])
+        box = Outbox(bot, workers=1)
+        box.send_message('1', text='hello')
+        box.close()
+
+        assert bot.sent == [('1', 'hello')]
+        assert pauses == [7, outbox.RETRY_BASE], (
+            'Проверьте, что учитывается retry_after и пауза при сетевой ошибке'
+        )
+
+    def test_dropped_message_is_not_reported_as_sent(self, caplog):
+        caplog.set_level(logging.INFO)
+        bot = MockBot()
+        limiter = RateLimiter(bot, chat_rate=1, max_wait=0)
+        box = Outbox(limiter, workers=1)
+        box.send_message('1', text='first')
+        box.send_message('1', text='second')
+        box.close()
+
+        assert bot.sent == [('1', 'first')]
+        messages = [record.getMessage() for record in caplog.records]
+        assert messages.count('Сообщение отправлено.') == 1, (
+            'Отброшенное по лимиту сообщение не должно считаться отправленным'
+        )
+        assert any('отброшено по лимиту' in text for text in messages)
+
+    def test_worker_survives_unexpected_error(self):
+        bot = MockBot([ValueError('неожиданно')])
+        box = Outbox(bot, workers=1)
+        box.send_message('1', text='lost')
+        box.send_message('1', text='delivered')
+        box.close()
+
+        assert bot.sent == [('1', 'delivered')], (
+            'Неожиданная ошибка не должна останавливать поток отправщика'
+        )
@@ -0,0 +1,50 @@
+from http import HTTPStatus
+
+import pytest
+import requests
+
+from exceptions import APIError
+from practicum_client import PracticumClient
+
+
+class MockResponse:
+
+    def __init__(self, status_code=HTTPStatus.OK):
+        self.status_code = status_code
+
+    def json(self):
+        return {'homeworks': [], 'current_date': 1}
+
+
+class TestPracticumClient:
+
+    def test_pooled_session_with_timeout(self, monkeypatch, api_url):
+        calls = []
+
+        def mock_session_get(session, url, **kwargs):
+            calls.append(kwargs)
+            return MockResponse()
+
+        monkeypatch.setattr(requests.Session, 'get', mock_session_get)
+        client = PracticumClient(api_url, pool_size=2, timeout=(1, 2))
+        client.open()
+        client.get_homeworks('token', 0)
+        client.get_homeworks('token', 0)
+        client.close()
+
+        assert len(calls) == 2, 'Запросы должны идти через сессию клиента'
+        assert all(kwargs['timeout'] == (1, 2) for kwargs in calls), (
+            'Проверьте, что клиент передаёт таймауты в каждый запрос'
+        )
+        assert client.request_count == 2
+        assert client.average_elapsed >= 0
+
+    def test_timeout_raises_api_error(self, monkeypatch, api_url):
+        def mock_get(*args, **kwargs):
+            raise requests.Timeout('timeout')
+
+        monkeypatch.setattr(requests, 'get', mock_get)
+        client = PracticumClient(api_url)
+        with pytest.raises(APIError):
+            client.get_homeworks('token', 0)
+        assert client.request_count == 1
@@ -0,0 +1,45 @@
+import metrics
+from rate_limit import RateLimiter, TokenBucket
+
+
+class TestRateLimiter:
+
+    def test_token_bucket(self):
+        bucket = TokenBucket(rate=2, burst=2)
+        now = bucket.updated
+        assert bucket.reserve(now) == 0
+        assert bucket.reserve(now) == 0
+        assert bucket.reserve(now) == 0.5, (
+            'После исчерпания запаса нужно ждать 1/rate секунды'
+        )
+
+    def test_per_chat_and_global_limits(self):
+        limiter = RateLimiter(global_rate=30, chat_rate=1, max_wait=60)
+        assert limiter.acquire('1') == 0
+        assert limiter.acquire('2') == 0
+        assert 0.9 < limiter.acquire('1') <= 1, (
+            'Второе сообщение в тот же чат должно ждать около секунды'
+        )
+        assert limiter.sent == 3
+
+    def test_drop_when_wait_too_long(self):
+        limiter = RateLimiter(chat_rate=1, max_wait=0.5)
+        limiter.acquire('1')
+        assert limiter.acquire('1') < 0
+        assert limiter.dropped == 1
+        assert limiter.acquire('2') == 0, (
+            'Отброшенное сообщение не должно расходовать общий лимит'
+        )
+
+    def test_wait_and_drops_are_exported(self):
+        waits, dropped = metrics.SEND_WAIT.count, metrics.SEND_DROPPED.value
+        limiter = RateLimiter(chat_rate=1, max_wait=0.5)
+        limiter.acquire('1')
+        limiter.acquire('1')
+        assert metrics.SEND_WAIT.count == waits + 1
+        assert metrics.SEND_DROPPED.value == dropped + 1, (
+            'Отброшенные по лимиту сообщения должны попадать в метрики'
+        )
+        assert 'homework_telegram_send_wait_seconds_bucket' in (
+            metrics.registry.render()
+        )
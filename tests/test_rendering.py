@@ -0,0 +1,97 @@
+from homework_record import make_record
+from rendering import EMOJI, Renderer, escape_markdown, settings_error
+
+
+def record(name='hw.zip', status='approved', comment='Всё (почти) хорошо'):
+    return make_record({
+        'id': 1, 'homework_name': name, 'status': status,
+        'date_updated': 'd1', 'reviewer_comment': comment,
+    })
+
+
+class TestRenderer:
+
+    def test_default_locale_keeps_old_format(self):
+        message = Renderer().render(record())
+        assert message == (
+            'Изменился статус проверки работы "hw.zip". '
+            'Работа проверена: ревьюеру всё понравилось. Ура! '
+            f'{EMOJI["approved"]} \n'
+            'Статус: approved \U0001F6A9 \n'
+            'Комментарий:Всё (почти) хорошо \U0001F4DC'
+        ), 'Проверьте, что текст уведомления по умолчанию не изменился'
+
+    def test_headline_and_locale(self):
+        renderer = Renderer('en')
+        assert renderer.headline(record(status='rejected')) == (
+            'Review status of "hw.zip" has changed. '
+            'The reviewer has some remarks on the homework.'
+        )
+        assert set(renderer.verdicts) == set(EMOJI)
+
+    def test_markdown_escaping(self):
+        message = Renderer(parse_mode='MarkdownV2').render(
+            record(name='a_b*.py')
+        )
+        assert '"a\\_b\\*\\.py"' in message, (
+            'Проверьте, что название работы экранируется для MarkdownV2'
+        )
+        assert 'Всё \\(почти\\) хорошо' in message
+        assert 'Ура\\!' in message, (
+            'Проверьте, что постоянный текст шаблона тоже экранирован'
+        )
+        assert escape_markdown('1.5') == '1\\.5'
+
+    def test_html_escaping(self):
+        message = Renderer(parse_mode='HTML').render(
+            record(comment='<b>x</b> & y')
+        )
+        assert '&lt;b&gt;x&lt;/b&gt; &amp; y' in message
+
+    def test_batch_and_empty_comment(self):
+        renderer = Renderer()
+        messages = renderer.render_batch(
+            [record(), record(status='reviewing', comment=None)]
+        )
+        assert messages[0] == renderer.render(record())
+        assert messages[1].endswith('Комментарий: \U0001F4DC'), (
+            'Проверьте, что отсутствующий комментарий не выводится как None'
+        )
+
+    def test_settings_error(self):
+        assert settings_error('ru', None) is None
+        assert settings_error('ru', 'Markdown') is None
+        assert 'xx' in settings_error('xx', None), (
+            'Неизвестный язык должен давать понятную ошибку настроек'
+        )
+        assert 'Plain' in settings_error('ru', 'Plain')
+
+    def test_legacy_markdown(self):
+        message = Renderer(parse_mode='Markdown').render(
+            record(name='a_b', comment='*x*')
+        )
+        assert '"a\\_b"' in message and '\\*x\\*' in message
+        assert 'Ура!' in message
+
+    def test_build_messages_renders_batch(self, monkeypatch):
+        import homework
+        import metrics
+
+        batches = []
+        render_batch = Renderer.render_batch
+
+        def spy(self, changes):
+            batches.append(list(changes))
+            return render_batch(self, changes)
+
+        monkeypatch.setattr(Renderer, 'render_batch', spy)
+        renders = metrics.RENDER.count
+        messages = homework.build_messages(
+            [record(), record(status='pending')]
+        )
+        assert len(batches) == 1 and len(batches[0]) == 1, (
+            'Изменения должны отрисовываться одним пакетом без '
+            'работ с неизвестным статусом'
+        )
+        assert metrics.RENDER.count == renders + 1
+        assert messages == [Renderer().render(record())]
@@ -0,0 +1,51 @@
+import metrics
+import tenants
+from fake_servers import Event, FakePracticum
+from practicum_client import PracticumClient
+from response_cache import ResponseCache, UnchangedResponse, fingerprint
+
+
+class TestResponseCache:
+
+    def test_fingerprint_ignores_current_date(self):
+        first = fingerprint(b'{"homeworks": [], "current_date": 1}')
+        second = fingerprint(b'{"homeworks": [], "current_date": 22}')
+        assert first[0] == second[0] and (first[1], second[1]) == (1, 22)
+
+    def test_only_valid_responses_are_skipped(self):
+        cache = ResponseCache()
+        body = b'{"homeworks": [1], "current_date": 1}'
+        digest, unchanged = cache.lookup('token', body)
+        cache.store('token', digest, None, {'homeworks': [1],
+                                            'current_date': 1})
+        assert cache.lookup('token', body)[1] is None, (
+            'Некорректный ответ должен проверяться при каждом повторе'
+        )
+        assert cache.skipped == 0
+
+    def test_repeated_poll_is_skipped(self):
+        timeline = {'token': [Event(0, {'id': 1, 'homework_name': 'hw',
+                                        'status': 'approved'})]}
+        cache = ResponseCache()
+        before = metrics.POLLS_SKIPPED.value
+        with FakePracticum(timeline, clock=lambda: 1000) as server:
+            client = PracticumClient(server.endpoint, cache=cache)
+            client.open()
+            state = tenants.TenantState('key', 0)
+            for _ in range(3):
+                response = client.get_homeworks('token', state.timestamp)
+                changes = tenants.process_response(state, response)
+            client.close()
+
+        assert isinstance(response, UnchangedResponse) and changes == []
+        assert cache.skipped == 1, (
+            'Второй пустой ответ отличается от первого, '
+            'третий повторяет второй и должен пропускаться'
+        )
+        assert metrics.POLLS_SKIPPED.value == before + 1
+        assert state.timestamp == response['current_date']
+
+    def test_not_modified_keeps_from_date(self):
+        cache = ResponseCache()
+        response = cache.not_modified(100)
+        assert response == {'homeworks': [], 'current_date': 100}
@@ -0,0 +1,44 @@
+from scheduler import IntervalPolicy, PollSchedule
+
+
+class TestPollSchedule:
+    policy = IntervalPolicy(
+        base=600, min_interval=60, max_interval=3600,
+        reviewing_interval=120, idle_interval=1800, idle_after=100
+    )
+
+    def test_reviewing_is_polled_faster(self):
+        schedule = PollSchedule(self.policy)
+        schedule.record_success(['reviewing'])
+        assert schedule.next_delay() == 120, (
+            'Пока работа на проверке, интервал опроса должен быть короче'
+        )
+        schedule.record_success(['approved'])
+        assert schedule.next_delay() == 600
+
+    def test_no_status_keeps_reviewing(self):
+        schedule = PollSchedule(self.policy)
+        schedule.record_success(['reviewing'])
+        schedule.record_success([])
+        assert schedule.next_delay() == 120
+
+    def test_backoff_on_failures(self):
+        schedule = PollSchedule(self.policy)
+        delays = []
+        for _ in range(3):
+            schedule.record_failure()
+            delays.append(schedule.next_delay())
+        assert 600 <= delays[0] <= 1200
+        assert 1200 <= delays[1] <= 2400
+        assert 2400 <= delays[2] <= 3600, (
+            'Интервал при ошибках не должен превышать максимум'
+        )
+        schedule.record_success([])
+        assert schedule.next_delay() == 600
+
+    def test_idle_interval(self):
+        schedule = PollSchedule(self.policy)
+        schedule.record_success(['approved'], now=0)
+        assert schedule.next_delay(now=1000) == 1800, (
+            'Без изменений долгое время опрос должен становиться реже'
+        )
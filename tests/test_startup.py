@@ -0,0 +1,63 @@
+import os
+import sys
+import json
+import subprocess
+
+import homework
+from startup import StartupReport
+
+
+class TestStartup:
+
+    def test_report_phases(self):
+        report = StartupReport()
+        assert report.mark('import')
+        assert not report.mark('import'), (
+            'Повторная отметка этапа не должна перезаписывать замер'
+        )
+        report.mark('config')
+        assert list(report.phases) == ['import', 'config']
+        assert report.summary().startswith('Запуск за ')
+
+    def test_check_config(self, monkeypatch, tmp_path, capsys):
+        monkeypatch.delenv('TENANTS_FILE', raising=False)
+        monkeypatch.setattr(homework, 'PRACTICUM_TOKEN', None)
+        assert homework.check_config() == 1
+
+        path = tmp_path / 'tenants.json'
+        path.write_text(json.dumps([{'token': 'a', 'chat_id': 1}]))
+        monkeypatch.setenv('TENANTS_FILE', str(path))
+        monkeypatch.setattr(homework, 'TELEGRAM_TOKEN', '1234:abcdefg')
+        assert homework.check_config() == 0, (
+            'Проверьте, что --check принимает корректный реестр'
+        )
+        assert 'подписок 1' in capsys.readouterr().out
+
+    def test_script_loads_homework_once(self, tmp_path):
+        script = (
+            'import runpy, sys\n'
+            'import practicum_client\n'
+            'clients = []\n'
+            'init = practicum_client.PracticumClient.__init__\n'
+            'def counting(self, *args, **kwargs):\n'
+            '    clients.append(self)\n'
+            '    init(self, *args, **kwargs)\n'
+            'practicum_client.PracticumClient.__init__ = counting\n'
+            'sys.argv = ["homework.py", "--check"]\n'
+            'try:\n'
+            '    runpy.run_path("homework.py", run_name="__main__")\n'
+            'except SystemExit:\n'
+            '    pass\n'
+            'print("clients", len(clients))\n'
+        )
+        path = tmp_path / 'tenants.json'
+        path.write_text(json.dumps([{'token': 'a', 'chat_id': 1}]))
+        result = subprocess.run(
+            [sys.executable, '-c', script], cwd=homework.BASE_DIR or '.',
+            capture_output=True, text=True,
+            env=dict(os.environ, TENANTS_FILE=str(path),
+                     TELEGRAM_TOKEN='1234:abcdefg')
+        )
+        assert 'clients 1' in result.stdout, (
+            'Запуск python homework.py не должен загружать модуль дважды'
+        )
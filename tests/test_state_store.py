@@ -0,0 +1,45 @@
+import tenants
+from homework_record import make_record
+from state_store import StateStore, state_key
+
+
+class TestStateStore:
+
+    def test_flush_and_reload(self, tmp_path, random_timestamp):
+        path = str(tmp_path / 'state.db')
+        key = state_key('token')
+        store = StateStore(path)
+        store.stage(key, random_timestamp)
+        store.stage_homeworks(key, [
+            make_record({'id': 1, 'status': 'approved', 'date_updated': 'd1'}),
+            make_record({'homework_name': 'hw', 'status': 'reviewing'}),
+        ])
+        assert store.load(key) is None, (
+            'До flush изменения не должны попадать в базу'
+        )
+        store.close()
+
+        store = StateStore(path)
+        assert store.load(key) == random_timestamp
+        assert store.load_homeworks(key) == {
+            '1': ('approved', 'd1'), 'hw': ('reviewing', None)
+        }
+        store.close()
+
+    def test_init_states_resume(self, tmp_path, random_timestamp):
+        store = StateStore(str(tmp_path / 'state.db'))
+        tenant = tenants.Tenant('token', ('1',))
+        key = state_key(tenant.token)
+        store.stage(key, random_timestamp)
+        homework = make_record({'id': 1, 'status': 'approved'})
+        store.stage_homeworks(key, [homework])
+        store.flush()
+
+        state = tenants.init_states([tenant], store=store)[tenant]
+        assert state.timestamp == random_timestamp, (
+            'После перезапуска опрос должен продолжаться с сохранённой метки'
+        )
+        assert not state.index.diff([homework]), (
+            'Известные до перезапуска статусы не должны отправляться повторно'
+        )
+        store.close()
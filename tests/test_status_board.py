@@ -0,0 +1,125 @@
+import time
+from types import SimpleNamespace
+
+import tenants
+from homework_record import make_record
+from rate_limit import RateLimiter
+from state_store import StateStore
+from status_board import StatusBoard
+
+
+class MockBot:
+
+    def __init__(self):
+        self.sent = []
+        self.edits = []
+        self.pinned = []
+
+    def send_message(self, chat_id=None, text=None, **kwargs):
+        self.sent.append((chat_id, text))
+        return SimpleNamespace(message_id=len(self.sent))
+
+    def edit_message_text(self, text, chat_id=None, message_id=None, **kw):
+        self.edits.append((chat_id, message_id, text))
+
+    def pin_chat_message(self, chat_id, message_id, **kwargs):
+        self.pinned.append((chat_id, message_id))
+
+
+class TestStatusBoard:
+
+    def test_board_is_edited_in_place(self, tmp_path):
+        bot = MockBot()
+        store = StateStore(str(tmp_path / 'state.db'))
+        board = StatusBoard(bot, store=store)
+
+        board.apply('1', [make_record({'id': 1, 'homework_name': 'hw1',
+                                       'status': 'reviewing'})])
+        board.apply('1', [make_record({'id': 1, 'homework_name': 'hw1',
+                                       'status': 'approved'})])
+        board.report_error('1', 'Cбой')
+        board.report_error('1', 'Cбой')
+
+        assert len(bot.sent) == 1 and bot.pinned == [('1', 1)], (
+            'Табло должно создаваться и закрепляться один раз'
+        )
+        assert len(bot.edits) == 2, (
+            'Изменения и повторяющаяся ошибка должны править табло'
+        )
+        assert 'hw1: approved' in bot.edits[0][2]
+        store.flush()
+        assert StatusBoard(bot, store=store).board('1').message_id == 1
+        store.close()
+
+    def test_only_verdicts_are_notified(self, monkeypatch, random_timestamp):
+        def mock_request_homeworks(token, current_timestamp):
+            return {
+                'homeworks': [
+                    {'id': 1, 'homework_name': 'hw1', 'status': 'reviewing'},
+                    {'id': 2, 'homework_name': 'hw2', 'status': 'approved'},
+                ],
+                'current_date': random_timestamp,
+            }
+
+        monkeypatch.setattr(
+            tenants.homework, 'request_homeworks', mock_request_homeworks
+        )
+        bot = MockBot()
+        tenant = tenants.Tenant('token', ('1',))
+        state = tenants.init_states([tenant])[tenant]
+        tenants.poll_tenant(bot, tenant, state, board=StatusBoard(bot))
+
+        board_text, notification = bot.sent[0][1], bot.sent[1][1]
+        assert 'hw1' in board_text and 'hw2' in board_text
+        assert '"hw2"' in notification and '"hw1"' not in notification, (
+            'Отдельное уведомление нужно только для нового вердикта'
+        )
+
+    def test_board_failure_does_not_stop_notifications(
+        self, monkeypatch, random_timestamp
+    ):
+        from telegram.error import NetworkError
+
+        monkeypatch.setattr(
+            tenants.homework, 'request_homeworks',
+            lambda token, current_timestamp: {
+                'homeworks': [{'id': 1, 'homework_name': 'hw1',
+                               'status': 'approved'}],
+                'current_date': random_timestamp,
+            }
+        )
+
+        class FlakyBot(MockBot):
+            def send_message(self, chat_id=None, text=None, **kwargs):
+                if chat_id == '1' and kwargs.get('disable_notification'):
+                    raise NetworkError('сбой')
+                return super().send_message(chat_id, text, **kwargs)
+
+        bot = FlakyBot()
+        tenant = tenants.Tenant('token', ('1', '2'))
+        state = tenants.init_states([tenant])[tenant]
+        tenants.poll_tenant(bot, tenant, state, board=StatusBoard(bot))
+
+        assert [chat_id for chat_id, _ in bot.sent] == ['2', '1', '2'], (
+            'Сбой табло в одном чате не должен мешать остальным чатам '
+            'и уведомлениям о вердиктах'
+        )
+
+    def test_throttled_update_is_deferred(self):
+        bot = MockBot()
+        limiter = RateLimiter(chat_rate=1)
+        board = StatusBoard(bot, limiter)
+        started = time.monotonic()
+        for index in range(3):
+            board.apply('1', [make_record({
+                'id': index, 'homework_name': f'hw{index}',
+                'status': 'reviewing'
+            })])
+        assert time.monotonic() - started < 0.04, (
+            'Ожидание лимита не должно задерживать цикл опроса'
+        )
+        assert len(bot.sent) == 1 and not bot.edits
+        board.close()
+        assert len(bot.edits) == 1 and 'hw2' in bot.edits[0][2], (
+            'Отложенные изменения должны уйти одной правкой'
+        )
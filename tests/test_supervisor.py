@@ -0,0 +1,56 @@
+from rate_limit import GLOBAL_RATE
+from supervisor import HashRing, Supervisor, assign
+from tenants import Tenant
+
+
+class TestSupervisor:
+
+    def test_assign_covers_all_tenants(self):
+        registry = [Tenant(f'token{number}', ('1',)) for number in range(200)]
+        shards = assign(registry, 4)
+        assert sorted(
+            tenant for shard in shards.values() for tenant in shard
+        ) == sorted(registry)
+        assert all(shards.values()), (
+            'Получатели должны распределяться по всем процессам'
+        )
+
+    def test_adding_node_moves_few_keys(self):
+        keys = [f'key{number}' for number in range(2000)]
+        before = HashRing(range(4))
+        after = HashRing(range(5))
+        moved = sum(before.node(key) != after.node(key) for key in keys)
+        assert moved < len(keys) * 0.35, (
+            'При добавлении процесса должна переезжать примерно 1/N ключей'
+        )
+        assert all(
+            after.node(key) == 4
+            for key in keys if before.node(key) != after.node(key)
+        )
+
+    def test_board_mode_keeps_chat_on_one_worker(self):
+        registry = [
+            Tenant(f'token{number}', (str(number), 'shared'))
+            for number in range(0, 100, 10)
+        ] + [
+            Tenant(f'other{number}', (f'c{number}',)) for number in range(50)
+        ]
+        shards = assign(registry, 4, by_chat=True)
+        owners = {
+            worker for worker, shard in shards.items()
+            for tenant in shard if 'shared' in tenant.chat_ids
+        }
+        assert len(owners) == 1, (
+            'В режиме табло получатели с общим чатом должны быть '
+            'в одном процессе'
+        )
+        assert sorted(
+            tenant for shard in shards.values() for tenant in shard
+        ) == sorted(registry)
+
+    def test_global_rate_is_split(self):
+        supervisor = Supervisor({0: [Tenant('a', ('1',))],
+                                 1: [Tenant('b', ('2',))], 2: []})
+        assert supervisor.global_rate == GLOBAL_RATE / 2, (
+            'Общий лимит бота должен делиться между работающими процессами'
+        )
@@ -0,0 +1,219 @@
+import json
+import sqlite3
+
+import pytest
+
+import tenants
+from scheduler import IntervalPolicy
+
+
+class MockBot:
+
+    def __init__(self):
+        self.sent = []
+
+    def send_message(self, chat_id=None, text=None, **kwargs):
+        self.sent.append((chat_id, text))
+
+
+class TestTenants:
+
+    def test_load_tenants_json(self, tmp_path):
+        path = tmp_path / 'tenants.json'
+        path.write_text(json.dumps([
+            {'token': 'a', 'chat_id': 1},
+            {'token': 'b', 'chat_id': '2'},
+        ]))
+        result = tenants.load_tenants(str(path))
+        assert result == [
+            tenants.Tenant('a', ('1',)), tenants.Tenant('b', ('2',))
+        ], 'Проверьте загрузку реестра получателей из JSON'
+
+    def test_load_tenants_sqlite(self, tmp_path):
+        path = str(tmp_path / 'tenants.db')
+        with sqlite3.connect(path) as connection:
+            connection.execute('CREATE TABLE tenants (token, chat_id)')
+            connection.execute("INSERT INTO tenants VALUES ('a', 1)")
+        assert tenants.load_tenants(path) == [
+            tenants.Tenant('a', ('1',))
+        ], 'Проверьте загрузку реестра получателей из SQLite'
+
+    def test_subscriptions_are_grouped(self, tmp_path):
+        path = tmp_path / 'tenants.json'
+        path.write_text(json.dumps([
+            {'token': 'a', 'chat_id': 1},
+            {'token': 'a', 'chat_ids': [2, 1]},
+        ]))
+        assert tenants.load_tenants(str(path)) == [
+            tenants.Tenant('a', ('1', '2'))
+        ], 'Чаты с одним токеном должны объединяться в одну подписку'
+
+    def test_entry_without_chat_is_rejected(self, tmp_path):
+        path = tmp_path / 'tenants.json'
+        path.write_text(json.dumps([{'token': 'a'}]))
+        with pytest.raises(KeyError):
+            tenants.load_tenants(str(path))
+
+        path = str(tmp_path / 'tenants.db')
+        with sqlite3.connect(path) as connection:
+            connection.execute('CREATE TABLE tenants (token, chat_id)')
+            connection.execute("INSERT INTO tenants VALUES ('a', NULL)")
+        with pytest.raises(ValueError):
+            tenants.load_tenants(path)
+
+    def test_poll_all(self, monkeypatch, random_timestamp):
+        def mock_request_homeworks(token, current_timestamp):
+            return {
+                'homeworks': [
+                    {'homework_name': f'hw_{token}', 'status': 'approved'}
+                ],
+                'current_date': random_timestamp,
+            }
+
+        monkeypatch.setattr(
+            tenants.homework, 'request_homeworks', mock_request_homeworks
+        )
+        bot = MockBot()
+        states = tenants.init_states(
+            [tenants.Tenant('a', ('1',)), tenants.Tenant('b', ('2',))]
+        )
+
+        tenants.poll_all(bot, states)
+        tenants.poll_all(bot, states)
+
+        assert [chat_id for chat_id, _ in bot.sent] == ['1', '2'], (
+            'Каждый получатель должен получить одно уведомление '
+            'о смене статуса'
+        )
+        assert 'hw_b' in bot.sent[1][1]
+        for state in states.values():
+            assert state.timestamp == random_timestamp
+
+    def test_fan_out(self, monkeypatch, random_timestamp):
+        calls = []
+
+        def mock_request_homeworks(token, current_timestamp):
+            calls.append(token)
+            return {
+                'homeworks': [{'homework_name': 'hw', 'status': 'approved'}],
+                'current_date': random_timestamp,
+            }
+
+        monkeypatch.setattr(
+            tenants.homework, 'request_homeworks', mock_request_homeworks
+        )
+        bot = MockBot()
+        states = tenants.init_states([tenants.Tenant('a', ('1', '2', '3'))])
+        tenants.poll_all(bot, states)
+
+        assert calls == ['a'], 'Подписка должна опрашивать API один раз'
+        assert [chat_id for chat_id, _ in bot.sent] == ['1', '2', '3']
+
+    def test_fan_out_survives_failed_chat(self, monkeypatch,
+                                          random_timestamp):
+        from telegram.error import NetworkError
+
+        monkeypatch.setattr(
+            tenants.homework, 'request_homeworks',
+            lambda token, current_timestamp: {
+                'homeworks': [{'homework_name': 'hw', 'status': 'approved'}],
+                'current_date': random_timestamp,
+            }
+        )
+
+        class FlakyBot(MockBot):
+            def send_message(self, chat_id=None, text=None, **kwargs):
+                if chat_id == '1':
+                    raise NetworkError('сбой')
+                super().send_message(chat_id, text, **kwargs)
+
+        bot = FlakyBot()
+        states = tenants.init_states([tenants.Tenant('a', ('1', '2', '3'))])
+        tenants.poll_all(bot, states)
+
+        assert [chat_id for chat_id, _ in bot.sent] == ['2', '3'], (
+            'Сбой отправки в один чат не должен лишать уведомления '
+            'остальные чаты подписки'
+        )
+
+    def test_invalid_homework_does_not_drop_batch(self, monkeypatch,
+                                                   random_timestamp):
+        monkeypatch.setattr(
+            tenants.homework, 'request_homeworks',
+            lambda token, current_timestamp: {
+                'homeworks': [
+                    {'id': 1, 'homework_name': 'hw1', 'status': 'approved'},
+                    {'id': 2, 'homework_name': 'hw2', 'status': 'pending'},
+                ],
+                'current_date': random_timestamp,
+            }
+        )
+        bot = MockBot()
+        states = tenants.init_states([tenants.Tenant('a', ('1',))])
+        tenants.poll_all(bot, states)
+
+        assert len(bot.sent) == 1 and '"hw1"' in bot.sent[0][1], (
+            'Работа с неизвестным статусом не должна лишать уведомления '
+            'остальные работы ответа'
+        )
+        assert 'hw2' not in bot.sent[0][1]
+
+    def test_repeated_errors_are_suppressed(self, monkeypatch,
+                                            random_timestamp):
+        responses = [KeyError('boom'), KeyError('boom'), {
+            'homeworks': [], 'current_date': random_timestamp
+        }]
+
+        def mock_request_homeworks(token, current_timestamp):
+            response = responses.pop(0)
+            if isinstance(response, Exception):
+                raise response
+            return response
+
+        monkeypatch.setattr(
+            tenants.homework, 'request_homeworks', mock_request_homeworks
+        )
+        bot = MockBot()
+        states = tenants.init_states([tenants.Tenant('a', ('1',))])
+        for _ in range(3):
+            tenants.poll_all(bot, states)
+
+        texts = [text for _, text in bot.sent]
+        assert len(texts) == 2, (
+            'Повтор той же ошибки не должен отправляться, '
+            'а после восстановления нужно одно сообщение'
+        )
+        assert texts[0].startswith('Cбой в программе')
+        assert 'восстановлена' in texts[1]
+
+    def test_overdue_polls_are_flushed(self, monkeypatch):
+        class Stop(Exception):
+            pass
+
+        polls = []
+
+        def mock_poll_safely(bot, tenant, state, store=None, board=None):
+            polls.append(tenant.token)
+            if len(polls) > 20:
+                raise Stop
+
+        class MockStore:
+            flushed = []
+
+            def flush(self):
+                self.flushed.append(len(polls))
+
+        monkeypatch.setattr(tenants, 'poll_safely', mock_poll_safely)
+        policy = IntervalPolicy(base=0, min_interval=0, max_interval=0)
+        states = tenants.init_states(
+            [tenants.Tenant('a', ('1',)), tenants.Tenant('b', ('2',))],
+            policy
+        )
+        store = MockStore()
+        with pytest.raises(Stop):
+            tenants.run(MockBot(), states, store)
+
+        assert store.flushed[:3] == [2, 4, 6], (
+            'Даже при просроченных опросах состояние нужно сохранять '
+            'раз за круг опроса'
+        )